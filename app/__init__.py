@@ -1,7 +1,7 @@
 from flask import Flask, render_template
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
-from config import Config
+from config import config_by_name
 import os
 
 # Initialize extensions, but don't configure them for a specific app yet
@@ -13,11 +13,16 @@ login_manager.login_message_category = "info"
 login_manager.login_message = "Please log in to access this page."
 
 
-def create_app(config_class=Config):
+def create_app(config_class=None):
     """
     Creates and configures an instance of the Flask application.
     This is the Application Factory.
+    Without an explicit config class, APP_CONFIG selects one from config.py
+    ("development" by default, "production" for the tuned SQLite profile).
     """
+    if config_class is None:
+        config_class = config_by_name[os.environ.get("APP_CONFIG", "development")]
+
     app = Flask(__name__, instance_relative_config=True)
 
     # Load configuration from the config object
@@ -33,6 +38,29 @@ def create_app(config_class=Config):
     db.init_app(app)
     login_manager.init_app(app)
 
+    from app.security import init_password_hasher
+
+    init_password_hasher(app)
+
+    # Apply SQLite PRAGMAs on every pooled connection and confirm they are active
+    from app.sqlite_tuning import install_sqlite_pragmas, pragma_mismatches
+
+    pragmas = app.config.get("SQLITE_PRAGMAS", {})
+    with app.app_context():
+        install_sqlite_pragmas(db.engine, pragmas)
+        mismatches = pragma_mismatches(db.engine, pragmas)
+        for name, (expected, active) in mismatches.items():
+            app.logger.warning(
+                "SQLite PRAGMA %s is %r, expected %r", name, active, expected
+            )
+        if pragmas and not mismatches:
+            app.logger.info("SQLite PRAGMAs active: %s", ", ".join(pragmas))
+
+        # Opt-in query and render timing (INSTRUMENTATION config flag)
+        from app.instrumentation import install_instrumentation
+
+        install_instrumentation(app, db.engine)
+
     # Register blueprints
     # A blueprint is a way to organize a group of related views and other code.
     from app.routes import bp as main_bp
@@ -44,12 +72,14 @@ def create_app(config_class=Config):
 
     register_commands(app)
 
-    # Define the user loader function for Flask-Login
-    from app.models import User
+    # Define the user loader function for Flask-Login, backed by a small TTL/LRU cache
+    from app.identity import init_user_cache, load_cached_user
+
+    init_user_cache(app)
 
     @login_manager.user_loader
     def load_user(user_id):
-        return User.query.get(int(user_id))
+        return load_cached_user(int(user_id))
 
     @app.errorhandler(403)
     def forbidden(error):
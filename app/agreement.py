@@ -0,0 +1,135 @@
+import numpy as np
+from app import db
+from app.models import LLMResult, VerificationAssignment
+
+
+def _ratio(numerator, denominator):
+    return float(numerator / denominator) if denominator else None
+
+
+def binary_agreement(y_true, y_pred):
+    """
+    Confusion matrix, precision/recall/F1, accuracy and Cohen's kappa for two
+    aligned boolean arrays. y_true is treated as the reference labels.
+    """
+    n = int(y_true.size)
+    tp = int(np.count_nonzero(y_true & y_pred))
+    fp = int(np.count_nonzero(~y_true & y_pred))
+    fn = int(np.count_nonzero(y_true & ~y_pred))
+    tn = n - tp - fp - fn
+
+    observed = _ratio(tp + tn, n)
+    expected = _ratio((tp + fp) * (tp + fn) + (fn + tn) * (fp + tn), n * n)
+    if observed is None:
+        kappa = None
+    elif expected == 1:
+        # Both raters used a single label throughout; kappa is undefined
+        kappa = 1.0 if observed == 1 else None
+    else:
+        kappa = (observed - expected) / (1 - expected)
+
+    precision = _ratio(tp, tp + fp)
+    recall = _ratio(tp, tp + fn)
+    f1 = 2 * precision * recall / (precision + recall) if precision and recall else None
+    return {
+        "n": n,
+        "tp": tp,
+        "fp": fp,
+        "fn": fn,
+        "tn": tn,
+        "accuracy": observed,
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "kappa": kappa,
+    }
+
+
+def load_review_extract():
+    """
+    Single columnar extract of every reviewed decision joined to the LLM verdicts
+    for the same article. One row per (assignment, model); assignments without
+    LLM results appear once with a null model.
+    """
+    rows = db.session.execute(
+        db.select(
+            VerificationAssignment.id,
+            VerificationAssignment.article_id,
+            VerificationAssignment.is_relevant,
+            LLMResult.llm_model_name,
+            LLMResult.is_relevant,
+        )
+        .outerjoin(LLMResult, LLMResult.article_id == VerificationAssignment.article_id)
+        .where(
+            VerificationAssignment.is_reviewed.is_(True),
+            VerificationAssignment.is_relevant.is_not(None),
+        )
+        .order_by(VerificationAssignment.article_id, VerificationAssignment.id)
+    ).all()
+
+    if not rows:
+        assignment_ids = article_ids = np.empty(0, dtype=np.int64)
+        human = llm_known = llm = np.empty(0, dtype=bool)
+        models = np.empty(0, dtype=object)
+    else:
+        assignment_ids, article_ids, human, models, llm_labels = zip(*rows)
+        assignment_ids = np.asarray(assignment_ids, dtype=np.int64)
+        article_ids = np.asarray(article_ids, dtype=np.int64)
+        human = np.asarray(human, dtype=bool)
+        models = np.asarray(models, dtype=object)
+        llm_labels = np.asarray(llm_labels, dtype=object)
+        llm_known = np.not_equal(llm_labels, None)
+        llm = np.asarray(np.where(llm_known, llm_labels, False), dtype=bool)
+
+    return {
+        "assignment_id": assignment_ids,
+        "article_id": article_ids,
+        "human": human,
+        "model": models,
+        "llm_known": llm_known,
+        "llm": llm,
+    }
+
+
+def human_pairs(extract):
+    """
+    Aligns the first two human decisions of every article reviewed at least twice.
+    Returns two boolean arrays (first reviewer, second reviewer).
+    """
+    # Reduce the (assignment x model) extract to one row per assignment
+    _, first_rows = np.unique(extract["assignment_id"], return_index=True)
+    order = np.lexsort(
+        (extract["assignment_id"][first_rows], extract["article_id"][first_rows])
+    )
+    rows = first_rows[order]
+    article_ids = extract["article_id"][rows]
+    labels = extract["human"][rows]
+
+    # Position of each row within its article's run of reviews
+    starts = np.r_[True, article_ids[1:] != article_ids[:-1]]
+    run_start = np.maximum.accumulate(np.where(starts, np.arange(article_ids.size), 0))
+    position = np.arange(article_ids.size) - run_start
+
+    second = np.flatnonzero(position == 1)
+    return labels[second - 1], labels[second]
+
+
+def compute_agreement():
+    """
+    Agreement between the two human reviewers and between human decisions and
+    each LLM model, from one extract and vectorized NumPy operations.
+    """
+    extract = load_review_extract()
+
+    first, second = human_pairs(extract)
+    human_stats = binary_agreement(first, second)
+
+    model_stats = []
+    known_models = extract["model"][extract["llm_known"]]
+    for model_name in sorted(set(known_models.tolist())):
+        mask = extract["llm_known"] & (extract["model"] == model_name)
+        stats = binary_agreement(extract["human"][mask], extract["llm"][mask])
+        stats["model"] = model_name
+        model_stats.append(stats)
+
+    return {"humans": human_stats, "models": model_stats}
@@ -0,0 +1,201 @@
+from collections import defaultdict
+from datetime import datetime, timezone
+from flask import json
+from sqlalchemy import and_, case, func
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.agreement import compute_agreement
+from app.usage import compute_usage_stats
+from app.models import (
+    User,
+    Article,
+    LLMResult,
+    VerificationAssignment,
+    AnalysisSnapshot,
+)
+
+LLM_CHART = "llm_chart"
+VERIFICATOR_CHART = "verificator_chart"
+AGREEMENT_STATS = "agreement_stats"
+USAGE_STATS = "usage_stats"
+
+CHART_COLORS = [
+    "rgba(67, 56, 202, 0.7)",
+    "rgba(219, 39, 119, 0.7)",
+    "rgba(245, 158, 11, 0.7)",
+    "rgba(16, 185, 129, 0.7)",
+    "rgba(99, 102, 241, 0.7)",
+]
+
+
+def _count_if(condition):
+    return func.sum(case((condition, 1), else_=0))
+
+
+def build_llm_chart_data():
+    """
+    Distribution of articles by the number of LLMs that marked them relevant, per source.
+    Computed with a single grouped query over narrow columns.
+    """
+    relevant_per_article = (
+        db.select(LLMResult.article_id, func.count().label("relevant_count"))
+        .where(LLMResult.is_relevant.is_(True))
+        .group_by(LLMResult.article_id)
+        .subquery()
+    )
+    relevant_count = func.coalesce(relevant_per_article.c.relevant_count, 0)
+    rows = db.session.execute(
+        db.select(Article.source, relevant_count, func.count())
+        .outerjoin(
+            relevant_per_article, relevant_per_article.c.article_id == Article.id
+        )
+        .group_by(Article.source, relevant_count)
+    ).all()
+
+    llm_analysis_data = defaultdict(lambda: defaultdict(int))
+    all_sources = set()
+    total_articles = 0
+    for source, count, articles in rows:
+        source = source or "Unknown"
+        llm_analysis_data[count][source] += articles
+        all_sources.add(source)
+        total_articles += articles
+
+    sorted_sources = sorted(all_sources)
+    llm_labels = sorted(llm_analysis_data.keys())
+    llm_datasets = []
+    for i, source in enumerate(sorted_sources):
+        raw_data_points = [
+            llm_analysis_data[label].get(source, 0) for label in llm_labels
+        ]
+        data_points = [
+            (count / total_articles) * 100 if total_articles > 0 else 0
+            for count in raw_data_points
+        ]
+        llm_datasets.append(
+            {
+                "label": source,
+                "data": data_points,
+                "raw_data": raw_data_points,
+                "backgroundColor": CHART_COLORS[i % len(CHART_COLORS)],
+            }
+        )
+
+    return {
+        "labels": [str(label) for label in llm_labels],
+        "datasets": llm_datasets,
+    }
+
+
+def build_verificator_chart_data():
+    """Review completion per verificator, from one grouped query over assignments."""
+    rows = db.session.execute(
+        db.select(
+            User.username,
+            func.count(VerificationAssignment.id),
+            _count_if(VerificationAssignment.is_reviewed.is_(True)),
+            _count_if(
+                and_(
+                    VerificationAssignment.is_reviewed.is_(True),
+                    VerificationAssignment.is_relevant.is_(True),
+                )
+            ),
+        )
+        .join(VerificationAssignment, VerificationAssignment.user_id == User.id)
+        .where(User.role == "verificator")
+        .group_by(User.id, User.username)
+        .order_by(User.id)
+    ).all()
+
+    verificator_stats = []
+    for username, total_assigned, reviewed_count, relevant_count in rows:
+        reviewed_count = reviewed_count or 0
+        relevant_count = relevant_count or 0
+        verificator_stats.append(
+            {
+                "username": username,
+                "percentage": (reviewed_count / total_assigned) * 100,
+                "total_assigned": total_assigned,
+                "reviewed_count": reviewed_count,
+                "relevant_count": relevant_count,
+                "not_relevant_count": reviewed_count - relevant_count,
+            }
+        )
+
+    sorted_stats = sorted(
+        verificator_stats, key=lambda x: x["percentage"], reverse=True
+    )
+
+    return {
+        "labels": [s["username"] for s in sorted_stats],
+        "datasets": [
+            {
+                "label": "Review Progress (%)",
+                "data": [s["percentage"] for s in sorted_stats],
+                "backgroundColor": "rgba(219, 39, 119, 0.7)",
+                "custom_data": sorted_stats,  # Pass all stats for the tooltip
+            }
+        ],
+    }
+
+
+CHART_BUILDERS = {
+    LLM_CHART: build_llm_chart_data,
+    VERIFICATOR_CHART: build_verificator_chart_data,
+    AGREEMENT_STATS: compute_agreement,
+    USAGE_STATS: compute_usage_stats,
+}
+
+
+def get_chart_data(name):
+    """Returns the JSON payload for a chart, rebuilding the snapshot only when it is stale."""
+    snapshot = db.session.get(AnalysisSnapshot, name)
+    if snapshot is not None and snapshot.payload is not None:
+        return snapshot.payload
+    return rebuild_snapshot(name, snapshot)
+
+
+def rebuild_snapshot(name, snapshot=None):
+    """
+    Recomputes a chart and stores it, unless the data was invalidated again while
+    it was being built. Returns the freshly computed payload either way.
+    """
+    if snapshot is None:
+        snapshot = db.session.get(AnalysisSnapshot, name)
+    payload = json.dumps(CHART_BUILDERS[name]())
+    built_at = datetime.now(timezone.utc)
+
+    if snapshot is None:
+        db.session.add(
+            AnalysisSnapshot(name=name, version=1, payload=payload, built_at=built_at)
+        )
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another request created the snapshot first
+            db.session.rollback()
+    else:
+        db.session.execute(
+            db.update(AnalysisSnapshot)
+            .where(
+                AnalysisSnapshot.name == name,
+                AnalysisSnapshot.version == snapshot.version,
+            )
+            .values(payload=payload, built_at=built_at)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+    return payload
+
+
+def invalidate_analysis(*names):
+    """
+    Marks chart snapshots as stale (all of them if no names are given).
+    Runs in the caller's transaction so it commits together with the data change.
+    """
+    db.session.execute(
+        db.update(AnalysisSnapshot)
+        .where(AnalysisSnapshot.name.in_(names or list(CHART_BUILDERS)))
+        .values(payload=None, version=AnalysisSnapshot.version + 1)
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,59 @@
+import json
+from sqlalchemy import func
+from app import db
+from app.models import LLMResult, AddressedArea
+
+
+def index_addressed_areas(condition):
+    """
+    Rebuilds the AddressedArea rows for the LLM results matching condition from their
+    stored JSON. Runs in the caller's transaction. Returns the number of area rows.
+    """
+    results = db.session.execute(
+        db.select(LLMResult.id, LLMResult._addressed_areas).where(condition)
+    ).all()
+    if not results:
+        return 0
+
+    db.session.execute(
+        db.delete(AddressedArea).where(
+            AddressedArea.llm_result_id.in_([result_id for result_id, _ in results])
+        )
+    )
+    rows = []
+    for result_id, areas_json in results:
+        areas = json.loads(areas_json) if areas_json else []
+        for area in dict.fromkeys(str(area).strip() for area in areas):
+            if area:
+                rows.append({"llm_result_id": result_id, "area": area})
+    if rows:
+        db.session.execute(db.insert(AddressedArea), rows)
+    return len(rows)
+
+
+def count_articles_per_area(model_name=None):
+    """
+    Counts distinct articles per addressed area, overall and per LLM model.
+    Returns {area: {"total": n, "by_model": {model_name: n}}}, most common areas first.
+    """
+    article_count = func.count(func.distinct(LLMResult.article_id))
+    query = db.select(AddressedArea.area).join(
+        LLMResult, LLMResult.id == AddressedArea.llm_result_id
+    )
+    if model_name is not None:
+        query = query.where(LLMResult.llm_model_name == model_name)
+
+    totals = db.session.execute(
+        query.add_columns(article_count)
+        .group_by(AddressedArea.area)
+        .order_by(article_count.desc(), AddressedArea.area)
+    ).all()
+    stats = {area: {"total": total, "by_model": {}} for area, total in totals}
+
+    for area, model, count in db.session.execute(
+        query.add_columns(LLMResult.llm_model_name, article_count).group_by(
+            AddressedArea.area, LLMResult.llm_model_name
+        )
+    ):
+        stats[area]["by_model"][model] = count
+    return stats
@@ -0,0 +1,113 @@
+import heapq
+import random
+from collections import defaultdict
+from sqlalchemy import func
+from app import db
+from app.models import Article, VerificationAssignment
+
+
+def balance_assignments(
+    article_ids,
+    verificator_ids,
+    reviewers_per_article=2,
+    weights=None,
+    seed=None,
+    load=None,
+    existing=None,
+):
+    """
+    Assigns each article to distinct verificators, always picking the least loaded
+    ones relative to their capacity weight. A min-heap keeps every pick O(log V).
+
+    weights maps user_id to a capacity weight (default 1.0, 0 excludes the user),
+    load holds assignment counts to balance against, and existing maps article_id
+    to the user_ids already reviewing it. Returns (pairs, load, shortfall) where
+    pairs are new (article_id, user_id) tuples and shortfall lists articles that
+    could not get enough distinct reviewers.
+    """
+    rnd = random.Random(seed)
+    weights = weights or {}
+    existing = existing or {}
+    load = defaultdict(int, load or {})
+
+    def entry(user_id):
+        # Random tie-breaker spreads equally loaded users across articles
+        return (load[user_id] / weights.get(user_id, 1.0), rnd.random(), user_id)
+
+    heap = [entry(v) for v in verificator_ids if weights.get(v, 1.0) > 0]
+    heapq.heapify(heap)
+
+    order = list(article_ids)
+    rnd.shuffle(order)
+
+    pairs = []
+    shortfall = []
+    for article_id in order:
+        already = existing.get(article_id, ())
+        needed = reviewers_per_article - len(already)
+        if needed <= 0:
+            continue
+
+        picked = []
+        passed_over = []
+        while len(picked) < needed and heap:
+            candidate = heapq.heappop(heap)
+            if candidate[2] in already:
+                passed_over.append(candidate)
+            else:
+                picked.append(candidate[2])
+
+        for user_id in picked:
+            load[user_id] += 1
+            pairs.append((article_id, user_id))
+            heapq.heappush(heap, entry(user_id))
+        for candidate in passed_over:
+            heapq.heappush(heap, candidate)
+
+        if len(picked) < needed:
+            shortfall.append(article_id)
+
+    return pairs, dict(load), shortfall
+
+
+def incremental_state(reviewers_per_article):
+    """
+    Loads what an incremental run needs, in three grouped/joined queries: the IDs of
+    articles with fewer than reviewers_per_article reviewers, the users already
+    reviewing those articles, and the current assignment count per user.
+    """
+    reviewer_count = func.count(VerificationAssignment.id)
+    understaffed = (
+        db.select(Article.id.label("article_id"))
+        .outerjoin(
+            VerificationAssignment, VerificationAssignment.article_id == Article.id
+        )
+        .group_by(Article.id)
+        .having(reviewer_count < reviewers_per_article)
+        .subquery()
+    )
+    article_ids = list(
+        db.session.scalars(
+            db.select(understaffed.c.article_id).order_by(understaffed.c.article_id)
+        )
+    )
+
+    existing = defaultdict(set)
+    for article_id, user_id in db.session.execute(
+        db.select(
+            VerificationAssignment.article_id, VerificationAssignment.user_id
+        ).join(
+            understaffed,
+            understaffed.c.article_id == VerificationAssignment.article_id,
+        )
+    ):
+        existing[article_id].add(user_id)
+
+    load = dict(
+        db.session.execute(
+            db.select(VerificationAssignment.user_id, func.count()).group_by(
+                VerificationAssignment.user_id
+            )
+        ).all()
+    )
+    return article_ids, existing, load
@@ -0,0 +1,119 @@
+from sqlalchemy import func, or_, tuple_
+from app import db
+from app.models import User, Article, LLMResult, VerificationAssignment
+
+MAX_PAGE_SIZE = 200
+AGREEMENT_CHOICES = ("agree", "disagree")
+
+
+def parse_cursor(cursor):
+    """Parses an "article_id:assignment_id" cursor, returning None if it is malformed."""
+    try:
+        article_id, assignment_id = (int(part) for part in cursor.split(":"))
+    except (AttributeError, ValueError):
+        return None
+    return article_id, assignment_id
+
+
+def list_assignments(
+    user,
+    reviewed=None,
+    source=None,
+    year=None,
+    agreement=None,
+    cursor=None,
+    limit=50,
+):
+    """
+    Returns one keyset page of assignments joined to their article and an LLM verdict
+    summary, ordered by (article_id, assignment id). Verificators only see their own
+    rows. Deep pages cost the same as the first because no OFFSET is used.
+    Returns (items, next_cursor).
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    # Correlated counts only run for the rows actually scanned before LIMIT is hit
+    llm_count = (
+        db.select(func.count())
+        .where(LLMResult.article_id == VerificationAssignment.article_id)
+        .scalar_subquery()
+    )
+    llm_relevant = (
+        db.select(func.count())
+        .where(
+            LLMResult.article_id == VerificationAssignment.article_id,
+            LLMResult.is_relevant.is_(True),
+        )
+        .scalar_subquery()
+    )
+
+    query = (
+        db.select(
+            VerificationAssignment.id,
+            VerificationAssignment.article_id,
+            VerificationAssignment.is_reviewed,
+            VerificationAssignment.is_relevant,
+            User.username,
+            Article.title,
+            Article.year,
+            Article.source,
+            llm_count.label("llm_count"),
+            llm_relevant.label("llm_relevant"),
+        )
+        .join(Article, Article.id == VerificationAssignment.article_id)
+        .join(User, User.id == VerificationAssignment.user_id)
+        .order_by(VerificationAssignment.article_id, VerificationAssignment.id)
+        .limit(limit + 1)
+    )
+
+    if user.role != "admin":
+        query = query.where(VerificationAssignment.user_id == user.id)
+    if reviewed is not None:
+        query = query.where(VerificationAssignment.is_reviewed.is_(reviewed))
+    if source:
+        query = query.where(
+            Article.source.is_(None)
+            if source == "Unknown"
+            else Article.source == source
+        )
+    if year is not None:
+        query = query.where(Article.year == year)
+    if agreement == "agree":
+        query = query.where(
+            llm_count > 0, or_(llm_relevant == 0, llm_relevant == llm_count)
+        )
+    elif agreement == "disagree":
+        query = query.where(llm_relevant > 0, llm_relevant < llm_count)
+
+    position = parse_cursor(cursor) if cursor else None
+    if position is not None:
+        query = query.where(
+            tuple_(VerificationAssignment.article_id, VerificationAssignment.id)
+            > tuple_(*position)
+        )
+
+    rows = db.session.execute(query).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = f"{rows[-1].article_id}:{rows[-1].id}"
+
+    items = [
+        {
+            "assignment_id": row.id,
+            "article_id": row.article_id,
+            "title": row.title,
+            "year": row.year,
+            "source": row.source,
+            "verificator": row.username,
+            "is_reviewed": row.is_reviewed,
+            "is_relevant": row.is_relevant,
+            "llm_count": row.llm_count,
+            "llm_relevant": row.llm_relevant,
+            "llm_agreement": (
+                None if not row.llm_count else row.llm_relevant in (0, row.llm_count)
+            ),
+        }
+        for row in rows
+    ]
+    return items, next_cursor
@@ -1,18 +1,101 @@
-from collections import defaultdict
-import random
 import click
 import numpy as np
 import pandas as pd
-import pickle
 import zipfile
+import zlib
 import os
-import re
+import time
 from app import db
-from app.models import User, Article, LLMResult, VerificationAssignment
+from app.models import (
+    User,
+    Article,
+    LLMResult,
+    VerificationAssignment,
+    IngestCheckpoint,
+)
+from app.compression import compress_text
+from app.export import (
+    DEFAULT_CHUNK_SIZE,
+    EXPORT_COLUMNS,
+    EXPORT_FORMATS,
+    ExportUnavailable,
+    parse_columns,
+    write_export,
+)
+from app.agreement import compute_agreement
+from app.areas import count_articles_per_area, index_addressed_areas
+from app.assignment import balance_assignments, incremental_state
+from app.ingest import ResultDecoder, article_id_for_member, iter_batches
+from app.analysis import (
+    AGREEMENT_STATS,
+    LLM_CHART,
+    USAGE_STATS,
+    VERIFICATOR_CHART,
+    CHART_BUILDERS,
+    invalidate_analysis,
+    rebuild_snapshot,
+)
+from app.progress import rebuild_progress
+from app.schema import ensure_columns, ensure_indexes
+from app.search import (
+    create_search_index,
+    index_articles,
+    index_justifications,
+    rebuild_search_index,
+    search_index_exists,
+)
 from app.seed import users_to_seed
+from app.usage import compute_usage_stats
+from app.sqlite_tuning import pragma_mismatches, read_sqlite_pragmas
+from sqlalchemy import and_
 from sqlalchemy.exc import IntegrityError
 
 
+def _existing_result_ids(model_name):
+    """Returns the IDs of articles that already have a result for the given model."""
+    return set(
+        db.session.scalars(
+            db.select(LLMResult.article_id).filter_by(llm_model_name=model_name)
+        )
+    )
+
+
+def _get_checkpoint(zip_filepath, model_name):
+    """Fetches the ingestion checkpoint for an archive, creating a fresh one if needed."""
+    archive = os.path.basename(zip_filepath)
+    archive_size = os.path.getsize(zip_filepath)
+    checkpoint = IngestCheckpoint.query.filter_by(
+        archive=archive, llm_model_name=model_name
+    ).first()
+    if checkpoint is None:
+        checkpoint = IngestCheckpoint(
+            archive=archive, archive_size=archive_size, llm_model_name=model_name
+        )
+        db.session.add(checkpoint)
+    elif checkpoint.archive_size != archive_size:
+        # A different file under the same name: start over
+        checkpoint.archive_size = archive_size
+        checkpoint.member_index = -1
+        checkpoint.last_member = None
+        checkpoint.completed = False
+    return checkpoint
+
+
+def _parse_weights(ctx, param, value):
+    """Parses repeated USERNAME=WEIGHT options into a dict."""
+    weights = {}
+    for item in value:
+        username, sep, weight = item.partition("=")
+        try:
+            weight = float(weight)
+        except ValueError:
+            weight = -1
+        if not sep or not username or weight < 0:
+            raise click.BadParameter(f"expected USERNAME=WEIGHT, got '{item}'")
+        weights[username] = weight
+    return weights
+
+
 def register_commands(app):
     """Register all custom CLI commands with the Flask app."""
 
@@ -21,6 +104,15 @@ def register_commands(app):
         """Creates all database tables from the models. Run this first."""
         db.create_all()
         click.echo("Database tables created.")
+        # Existing databases do not get new columns or indexes from create_all()
+        for name in ensure_columns():
+            click.echo(f"  - Added column '{name}'.")
+        for name in ensure_indexes():
+            click.echo(f"  - Created index '{name}'.")
+        had_search_index = search_index_exists()
+        if create_search_index() and not had_search_index:
+            rebuild_search_index()
+            click.echo("  - Created and populated the full-text search index.")
 
     @app.cli.command("seed-users")
     def seed_users():
@@ -43,50 +135,79 @@ def register_commands(app):
                     click.echo(
                         f"  - User '{username}' already exists. Role set to '{role}'."
                     )
+            invalidate_analysis(VERIFICATOR_CHART)
             db.session.commit()
             click.echo("User seeding complete.")
 
     @app.cli.command("seed-articles")
     @click.argument("csv_filepath", type=click.Path(exists=True))
-    def seed_articles(csv_filepath):
-        """Seeds the database with articles from a CSV file."""
+    @click.option(
+        "--chunk-size",
+        type=click.IntRange(min=1),
+        default=5000,
+        show_default=True,
+        help="Number of CSV rows read and inserted per transaction.",
+    )
+    def seed_articles(csv_filepath, chunk_size):
+        """Seeds the database with articles from a CSV file in bulk."""
         total = 0
+        skipped = 0
+        started = time.perf_counter()
         with app.app_context():
             click.echo(f"Seeding articles from '{csv_filepath}'...")
             try:
-                df = pd.read_csv(csv_filepath)
-                if "source" not in df.columns:
-                    df["source"] = None
-                df = df.replace({np.nan: None})
-
-                values = df.values
-
-                for idx, (doi, title, abstract, year, source) in enumerate(values):
-                    # Check if article with this DOI already exists
-                    article_id = idx + 1
-                    exists = Article.query.get(article_id)
-                    if not exists:
-                        article = Article(
-                            doi=(doi or ""),
-                            title=(title or ""),
-                            abstract=abstract,
-                            year=year,
-                            source=source,
-                        )
-                        db.session.add(article)
-                        total += 1
-                        click.echo(f"  - Added article: ID {article_id}")
-                    else:
-                        click.echo(
-                            f"  - Article with ID {article_id} already exists. Skipping."
+                # Load every existing ID once instead of one lookup per CSV row
+                existing_ids = set(db.session.scalars(db.select(Article.id)))
+                search_enabled = search_index_exists()
+
+                row_offset = 0
+                for chunk in pd.read_csv(csv_filepath, chunksize=chunk_size):
+                    if "source" not in chunk.columns:
+                        chunk["source"] = None
+                    chunk = chunk.replace({np.nan: None})
+
+                    rows = []
+                    for idx, (doi, title, abstract, year, source) in enumerate(
+                        chunk.values, start=row_offset
+                    ):
+                        # Article IDs follow the row position in the CSV
+                        article_id = idx + 1
+                        if article_id in existing_ids:
+                            skipped += 1
+                            continue
+                        rows.append(
+                            {
+                                "id": article_id,
+                                "doi": (doi or ""),
+                                "title": (title or ""),
+                                "abstract": abstract,
+                                "year": int(year) if year is not None else None,
+                                "source": source,
+                            }
                         )
+                    row_offset += len(chunk)
+
+                    if rows:
+                        db.session.execute(db.insert(Article), rows)
+                        if search_enabled:
+                            index_articles(Article.id.in_([row["id"] for row in rows]))
+                        invalidate_analysis(LLM_CHART)
+                    db.session.commit()
+                    total += len(rows)
+                    click.echo(
+                        f"  - Processed {row_offset} rows ({total} added, {skipped} skipped)."
+                    )
 
-                db.session.commit()
                 click.echo("Article seeding complete.")
             except Exception as e:
                 click.echo(f"An error occurred during article seeding: {e}", err=True)
                 db.session.rollback()
-        print(f"Seeding done with total {total} articles")
+        elapsed = time.perf_counter() - started
+        rate = (total + skipped) / elapsed if elapsed > 0 else 0
+        click.echo(
+            f"Seeding done with total {total} articles "
+            f"({skipped} skipped) in {elapsed:.1f}s, {rate:.0f} rows/sec"
+        )
 
     @app.cli.command("seed-llm")
     @click.argument("zip_filepaths", nargs=-1, type=click.Path(exists=True))
@@ -97,7 +218,28 @@ def register_commands(app):
     @click.option(
         "--cost-out", type=float, default=1, help="LLM output cost / 1M tokens"
     )
-    def seed_llm(zip_filepaths, model_name, cost_in, cost_out):
+    @click.option(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes used to unpickle results (default: CPU count, 1 = inline).",
+    )
+    @click.option(
+        "--batch-size",
+        type=click.IntRange(min=1),
+        default=1000,
+        show_default=True,
+        help="Number of zip members decoded, inserted and committed per batch.",
+    )
+    @click.option(
+        "--resume/--no-resume",
+        default=True,
+        show_default=True,
+        help="Continue from the checkpoint recorded for each archive and model.",
+    )
+    def seed_llm(
+        zip_filepaths, model_name, cost_in, cost_out, workers, batch_size, resume
+    ):
         """Seeds the database with LLM results from one or more zip files."""
         if not zip_filepaths:
             click.echo(
@@ -107,156 +249,500 @@ def register_commands(app):
             return
 
         with app.app_context():
-            for zip_filepath in zip_filepaths:
-                click.echo(
-                    f"\nProcessing LLM results for model '{model_name}' from '{zip_filepath}'..."
-                )
+            # Pre-load lookups once instead of two queries per zip member
+            valid_ids = set(db.session.scalars(db.select(Article.id)))
+            existing_ids = _existing_result_ids(model_name)
+            search_enabled = search_index_exists()
 
-                try:
-                    with zipfile.ZipFile(zip_filepath, "r") as z:
-                        for filename in z.namelist():
-                            if filename.startswith("__MACOSX/") or filename.endswith(
-                                "/"
-                            ):
-                                continue
-
-                            match = re.search(r"res-(\d+)\.pkl$", filename)
-                            if not match:
-                                continue
+            with ResultDecoder(model_name, cost_in, cost_out, workers) as decoder:
+                for zip_filepath in zip_filepaths:
+                    click.echo(
+                        f"\nProcessing LLM results for model '{model_name}' from '{zip_filepath}'..."
+                    )
+                    started = time.perf_counter()
+
+                    try:
+                        checkpoint = _get_checkpoint(zip_filepath, model_name)
+                        if not resume:
+                            checkpoint.member_index = -1
+                            checkpoint.last_member = None
+                            checkpoint.completed = False
+                        elif checkpoint.completed:
+                            click.echo(
+                                f"  - Archive already fully ingested for '{model_name}'. Skipping."
+                            )
+                            continue
 
-                            article_id = int(match.group(1)) + 1
-                            if not Article.query.get(article_id):
+                        with zipfile.ZipFile(zip_filepath, "r") as z:
+                            names = z.namelist()
+                            start = checkpoint.resume_index(names)
+                            if start:
                                 click.echo(
-                                    f"  - Warning: No article found for ID {article_id}. Skipping.",
-                                    err=True,
+                                    f"  - Resuming after member {start}/{len(names)} ('{checkpoint.last_member}')."
                                 )
-                                continue
 
-                            # Check if this specific result already exists
-                            exists = LLMResult.query.filter_by(
-                                article_id=article_id, llm_model_name=model_name
-                            ).first()
-                            if exists:
+                            added = 0
+                            missing = 0
+                            duplicates = 0
+                            corrupt = []
+                            for offset in range(start, len(names), batch_size):
+                                window = names[offset : offset + batch_size]
+                                payloads = []
+                                members = {}
+                                for filename in window:
+                                    article_id = article_id_for_member(filename)
+                                    if article_id is None:
+                                        continue
+                                    if article_id not in valid_ids:
+                                        missing += 1
+                                        continue
+                                    if article_id in existing_ids:
+                                        duplicates += 1
+                                        continue
+                                    try:
+                                        blob = z.read(filename)
+                                    except (zipfile.BadZipFile, zlib.error) as e:
+                                        corrupt.append((filename, str(e)))
+                                        continue
+                                    existing_ids.add(article_id)
+                                    payloads.append((article_id, blob))
+                                    members[article_id] = filename
+
+                                # Undecodable members are skipped so the checkpoint can move past them
+                                rows, failed = decoder.map(payloads)
+                                for article_id, error in failed:
+                                    existing_ids.discard(article_id)
+                                    corrupt.append((members[article_id], error))
+                                if rows:
+                                    db.session.execute(db.insert(LLMResult), rows)
+                                    batch_results = and_(
+                                        LLMResult.llm_model_name == model_name,
+                                        LLMResult.article_id.in_(
+                                            [row["article_id"] for row in rows]
+                                        ),
+                                    )
+                                    index_addressed_areas(batch_results)
+                                    if search_enabled:
+                                        index_justifications(batch_results)
+                                    invalidate_analysis(
+                                        LLM_CHART, AGREEMENT_STATS, USAGE_STATS
+                                    )
+
+                                # The checkpoint moves in the same transaction as the rows it covers
+                                checkpoint.member_index = offset + len(window) - 1
+                                checkpoint.last_member = window[-1]
+                                db.session.commit()
+                                added += len(rows)
                                 click.echo(
-                                    f"  - Result for article ID {article_id} and model '{model_name}' already exists. Skipping."
+                                    f"  - Processed {offset + len(window)}/{len(names)} members ({added} added)."
                                 )
-                                continue
-
-                            with z.open(filename) as pkl_file:
-                                data = pickle.load(pkl_file)
-
-                            result_data = data.get("result", {})
-                            usage_data = data.get("usage", {})
-
-                            llm_result = LLMResult(
-                                success=data.get("success", False),
-                                raw=data.get("raw"),
-                                is_relevant=result_data.get("is_relevant"),
-                                justification=result_data.get("justification"),
-                                duration=usage_data.get("duration"),
-                                num_token_in=usage_data.get("num_token_in", 0)
-                                * cost_in,
-                                num_token_out=usage_data.get("num_token_out", 0)
-                                * cost_out,
-                                llm_model_name=model_name,
-                                article_id=article_id,
+
+                        checkpoint.completed = True
+                        db.session.commit()
+
+                        if missing:
+                            click.echo(
+                                f"  - Warning: {missing} results reference unknown article IDs. Skipped.",
+                                err=True,
                             )
-                            llm_result.addressed_areas = result_data.get(
-                                "addressed_areas"
+                        if corrupt:
+                            click.echo(
+                                f"  - Warning: {len(corrupt)} corrupt members could not be decoded. Skipped:",
+                                err=True,
                             )
-
-                            db.session.add(llm_result)
+                            for member, error in corrupt[:10]:
+                                click.echo(f"      {member}: {error}", err=True)
+                            if len(corrupt) > 10:
+                                click.echo(
+                                    f"      ... and {len(corrupt) - 10} more.", err=True
+                                )
+                        if duplicates:
                             click.echo(
-                                f"  - Adding result for article ID {article_id}."
+                                f"  - {duplicates} results for model '{model_name}' already existed. Skipped."
                             )
-
-                    db.session.commit()
-                    click.echo(f"Finished processing '{zip_filepath}'.")
-                except Exception as e:
-                    click.echo(
-                        f"An error occurred processing {zip_filepath}: {e}", err=True
-                    )
-                    db.session.rollback()
+                        elapsed = time.perf_counter() - started
+                        rate = added / elapsed if elapsed > 0 else 0
+                        click.echo(
+                            f"Finished processing '{zip_filepath}' "
+                            f"({added} results in {elapsed:.1f}s, {rate:.0f} rows/sec)."
+                        )
+                    except Exception as e:
+                        click.echo(
+                            f"An error occurred processing {zip_filepath}: {e}",
+                            err=True,
+                        )
+                        db.session.rollback()
+                        # Forget IDs from the failed batch; committed ones are reloaded
+                        existing_ids = _existing_result_ids(model_name)
+                        click.echo(
+                            "  - Completed batches were kept. Rerun to resume from the last checkpoint.",
+                            err=True,
+                        )
 
         click.echo("\nLLM result seeding process complete!")
 
     @app.cli.command("seed-assignments")
-    def seed_assignments():
-        """Assigns each article to two different verificators randomly and evenly."""
+    @click.option(
+        "--reviewers",
+        type=click.IntRange(min=1),
+        default=2,
+        show_default=True,
+        help="Number of distinct verificators assigned to each article.",
+    )
+    @click.option(
+        "--weight",
+        "weights",
+        multiple=True,
+        callback=_parse_weights,
+        metavar="USERNAME=WEIGHT",
+        help="Relative capacity of a verificator (default 1, 0 excludes). Repeatable.",
+    )
+    @click.option(
+        "--seed", type=int, default=None, help="Random seed for a reproducible split."
+    )
+    @click.option(
+        "--batch-size",
+        type=click.IntRange(min=1),
+        default=5000,
+        show_default=True,
+        help="Number of assignment rows per bulk insert.",
+    )
+    @click.option(
+        "--incremental",
+        is_flag=True,
+        help="Only fill articles that lack reviewers, keeping existing assignments.",
+    )
+    def seed_assignments(reviewers, weights, seed, batch_size, incremental):
+        """Assigns each article to distinct verificators randomly and evenly."""
         with app.app_context():
             click.echo("Creating verification assignments...")
 
-            # Clear existing assignments to ensure a fresh start
-            VerificationAssignment.query.delete()
-            db.session.commit()
-            click.echo("  - Cleared all previous assignments.")
-
-            articles = Article.query.all()
+            has_articles = db.session.scalar(db.select(Article.id).limit(1))
             verificators = User.query.filter_by(role="verificator").all()
 
-            if not articles:
+            if not has_articles:
                 click.echo(
                     "Error: No articles found in the database. Please run 'seed-articles' first.",
                     err=True,
                 )
                 return
-            if len(verificators) < 2:
+
+            usernames = {v.id: v.username for v in verificators}
+            user_ids = {v.username: v.id for v in verificators}
+            unknown = sorted(set(weights) - set(user_ids))
+            if unknown:
                 click.echo(
-                    "Error: At least two users with the 'verificator' role are required.",
+                    f"Error: Unknown verificator(s) in --weight: {', '.join(unknown)}",
                     err=True,
                 )
                 return
+            # Verificators weighted 0 never receive articles, so they do not count
+            available = sum(1 for v in verificators if weights.get(v.username, 1) > 0)
+            if available < reviewers:
+                click.echo(
+                    f"Error: At least {reviewers} users with the 'verificator' role and a "
+                    f"weight above 0 are required ({available} available).",
+                    err=True,
+                )
+                return
+
+            if incremental:
+                article_ids, existing, current_load = incremental_state(reviewers)
+                # Users who are no longer verificators keep their work but get nothing new
+                current_load = {
+                    v_id: count
+                    for v_id, count in current_load.items()
+                    if v_id in usernames
+                }
+                click.echo(f"  - {len(article_ids)} articles need more reviewers.")
+            else:
+                article_ids = list(
+                    db.session.scalars(db.select(Article.id).order_by(Article.id))
+                )
+                existing, current_load = {}, {}
+
+            pairs, load, shortfall = balance_assignments(
+                article_ids,
+                sorted(usernames),
+                reviewers_per_article=reviewers,
+                weights={user_ids[name]: w for name, w in weights.items()},
+                seed=seed,
+                load=current_load,
+                existing=existing,
+            )
+            if shortfall:
+                sample = ", ".join(map(str, sorted(shortfall)[:10]))
+                more = ", ..." if len(shortfall) > 10 else ""
+                summary = (
+                    f"{len(shortfall)} article(s) could not get {reviewers} distinct "
+                    f"verificators (e.g. {sample}{more})."
+                )
+                if not incremental:
+                    # Nothing has been deleted yet; keep the existing assignments
+                    click.echo(
+                        f"Error: {summary} No assignments were changed.", err=True
+                    )
+                    return
+                click.echo(f"Warning: {summary}", err=True)
+
+            # Clear existing assignments and write the new ones in a single transaction
+            if not incremental:
+                VerificationAssignment.query.delete()
+                click.echo("  - Cleared all previous assignments.")
+            rows = [
+                {"article_id": article_id, "user_id": user_id}
+                for article_id, user_id in sorted(pairs)
+            ]
+            for batch in iter_batches(rows, batch_size):
+                db.session.execute(db.insert(VerificationAssignment), batch)
+
+            invalidate_analysis(VERIFICATOR_CHART, AGREEMENT_STATS)
+            db.session.commit()
+            rebuild_progress()
+            click.echo(f"  - Successfully created {len(rows)} new assignments.")
+            click.echo("Assignment distribution:")
+            for v_id, count in sorted(load.items()):
+                click.echo(f"  - {usernames[v_id]}: {count} articles")
+
+    @app.cli.command("rebuild-analysis")
+    def rebuild_analysis():
+        """Eagerly rebuilds the materialized chart snapshots for the analysis page."""
+        with app.app_context():
+            for name in CHART_BUILDERS:
+                started = time.perf_counter()
+                rebuild_snapshot(name)
+                click.echo(
+                    f"  - Rebuilt '{name}' in {time.perf_counter() - started:.2f}s."
+                )
+            click.echo("Analysis snapshots are up to date.")
+
+    @app.cli.command("index-areas")
+    @click.option(
+        "--batch-size",
+        type=click.IntRange(min=1),
+        default=5000,
+        show_default=True,
+        help="Number of LLM results processed per transaction.",
+    )
+    def index_areas(batch_size):
+        """Backfills the addressed-area side table from the stored JSON of every result."""
+        with app.app_context():
+            last_id = 0
+            results = 0
+            areas = 0
+            while True:
+                ids = list(
+                    db.session.scalars(
+                        db.select(LLMResult.id)
+                        .where(LLMResult.id > last_id)
+                        .order_by(LLMResult.id)
+                        .limit(batch_size)
+                    )
+                )
+                if not ids:
+                    break
+                areas += index_addressed_areas(LLMResult.id.between(ids[0], ids[-1]))
+                db.session.commit()
+                results += len(ids)
+                last_id = ids[-1]
+                click.echo(f"  - Indexed {results} results ({areas} area rows).")
+            click.echo("Addressed area indexing complete.")
+
+    @app.cli.command("area-stats")
+    @click.option("--model-name", default=None, help="Restrict counts to one model.")
+    def area_stats(model_name):
+        """Prints the number of articles per addressed area, overall and per model."""
+        with app.app_context():
+            stats = count_articles_per_area(model_name)
+            if not stats:
+                click.echo("No addressed areas indexed. Run 'flask index-areas' first.")
+                return
+            for area, counts in stats.items():
+                per_model = ", ".join(
+                    f"{model}: {count}"
+                    for model, count in sorted(counts["by_model"].items())
+                )
+                click.echo(f"  - {area}: {counts['total']} articles ({per_model})")
 
-            article_ids = [a.id for a in articles]
-            verificator_ids = [v.id for v in verificators]
+    @app.cli.command("compress-raw")
+    @click.option(
+        "--batch-size",
+        type=click.IntRange(min=1),
+        default=2000,
+        show_default=True,
+        help="Number of LLM results recompressed per transaction.",
+    )
+    @click.option(
+        "--vacuum", is_flag=True, help="Run VACUUM afterwards to shrink the file."
+    )
+    def compress_raw(batch_size, vacuum):
+        """Moves uncompressed raw LLM responses into the compressed column."""
+        with app.app_context():
+            last_id = 0
+            converted = 0
+            bytes_before = 0
+            bytes_after = 0
+            while True:
+                batch = db.session.execute(
+                    db.select(LLMResult.id, LLMResult._raw_text)
+                    .where(LLMResult.id > last_id, LLMResult._raw_text.is_not(None))
+                    .order_by(LLMResult.id)
+                    .limit(batch_size)
+                ).all()
+                if not batch:
+                    break
+                updates = []
+                for result_id, raw_text in batch:
+                    compressed = compress_text(raw_text)
+                    bytes_before += len(raw_text.encode("utf-8"))
+                    bytes_after += len(compressed)
+                    updates.append(
+                        {
+                            "id": result_id,
+                            "_raw_compressed": compressed,
+                            "_raw_text": None,
+                        }
+                    )
+                db.session.execute(db.update(LLMResult), updates)
+                db.session.commit()
+                converted += len(updates)
+                last_id = batch[-1][0]
+                click.echo(f"  - Compressed {converted} results.")
 
-            # Create a list of all review slots that need to be filled (2 for each article)
-            review_slots = article_ids * 2
-            random.shuffle(review_slots)
+            saved = bytes_before - bytes_after
+            ratio = (bytes_after / bytes_before * 100) if bytes_before else 0
+            click.echo(
+                f"Compressed {converted} raw responses: {bytes_before:,} -> "
+                f"{bytes_after:,} bytes ({ratio:.1f}%), {saved:,} bytes saved."
+            )
+            if vacuum:
+                click.echo("Running VACUUM...")
+                with db.engine.connect() as connection:
+                    connection.exec_driver_sql("VACUUM")
+                click.echo("VACUUM complete.")
+
+    @app.cli.command("db-pragmas")
+    def db_pragmas():
+        """Shows the SQLite PRAGMA values active on a pooled connection."""
+        with app.app_context():
+            if db.engine.dialect.name != "sqlite":
+                click.echo(f"Database is {db.engine.dialect.name}, not SQLite.")
+                return
+            pragmas = app.config.get("SQLITE_PRAGMAS", {})
+            names = list(pragmas) or [
+                "journal_mode",
+                "synchronous",
+                "busy_timeout",
+                "cache_size",
+                "mmap_size",
+            ]
+            mismatches = pragma_mismatches(db.engine, pragmas)
+            for name, value in read_sqlite_pragmas(db.engine, names).items():
+                status = "MISMATCH" if name in mismatches else "ok"
+                click.echo(f"  - {name} = {value} ({status})")
+
+    @app.cli.command("rebuild-search")
+    def rebuild_search():
+        """Rebuilds the full-text search index over articles and LLM justifications."""
+        with app.app_context():
+            if not create_search_index():
+                click.echo("Full-text search requires SQLite with FTS5.", err=True)
+                return
+            started = time.perf_counter()
+            rebuild_search_index()
+            click.echo(f"Search index rebuilt in {time.perf_counter() - started:.1f}s.")
 
-            # Dictionary to track assignments and prevent duplicates
-            assignments = defaultdict(list)
-            # Dictionary to track the load of each verificator
-            load = defaultdict(int)
+    @app.cli.command("agreement")
+    def agreement():
+        """Prints human-human and human-LLM agreement statistics."""
 
-            for article_id in review_slots:
-                # Sort verificators by their current load, then randomly to break ties
-                sorted_verificators = sorted(
-                    verificator_ids, key=lambda v_id: (load[v_id], random.random())
+        def fmt(value):
+            return "-" if value is None else f"{value:.3f}"
+
+        with app.app_context():
+            stats = compute_agreement()
+            humans = stats["humans"]
+            click.echo(
+                f"Human reviewers: {humans['n']} articles with two reviews, "
+                f"agreement {fmt(humans['accuracy'])}, kappa {fmt(humans['kappa'])}"
+            )
+            click.echo(
+                f"\n{'Model':<24} {'n':>7} {'TP':>6} {'FP':>6} {'FN':>6} {'TN':>6} "
+                f"{'Prec':>6} {'Rec':>6} {'F1':>6} {'Kappa':>6}"
+            )
+            for m in stats["models"]:
+                click.echo(
+                    f"{m['model']:<24} {m['n']:>7} {m['tp']:>6} {m['fp']:>6} "
+                    f"{m['fn']:>6} {m['tn']:>6} {fmt(m['precision']):>6} "
+                    f"{fmt(m['recall']):>6} {fmt(m['f1']):>6} {fmt(m['kappa']):>6}"
                 )
 
-                assigned_verificator = None
-                for v_id in sorted_verificators:
-                    # Find a verificator who is not already assigned to this article
-                    if v_id not in assignments[article_id]:
-                        assigned_verificator = v_id
-                        break
+    @app.cli.command("usage-stats")
+    def usage_stats():
+        """Prints per-model cost, latency and throughput statistics."""
 
-                if assigned_verificator:
-                    assignments[article_id].append(assigned_verificator)
-                    load[assigned_verificator] += 1
-                else:
-                    # This case should ideally not be hit with this logic, but is a safeguard
-                    click.echo(
-                        f"Warning: Could not find a suitable second verificator for article {article_id}",
-                        err=True,
-                    )
+        def fmt(value, spec=".2f"):
+            return "-" if value is None else format(value, spec)
 
-            # Create the assignment objects in the database
-            new_assignments_count = 0
-            for article_id, assigned_ids in assignments.items():
-                for user_id in assigned_ids:
-                    assignment = VerificationAssignment(
-                        article_id=article_id, user_id=user_id
-                    )
-                    db.session.add(assignment)
-                    new_assignments_count += 1
+        with app.app_context():
+            stats = compute_usage_stats()
+            if not stats:
+                click.echo("No LLM results found.")
+                return
+            click.echo(
+                f"{'Model':<24} {'Results':>8} {'Cost $':>10} {'p50 $':>8} {'p95 $':>8} "
+                f"{'p50 s':>7} {'p95 s':>7} {'p99 s':>7} {'tok/s':>7}"
+            )
+            for m in stats:
+                click.echo(
+                    f"{m['model']:<24} {m['results']:>8} {fmt(m['total_cost']):>10} "
+                    f"{fmt(m['cost_p50'], '.4f'):>8} {fmt(m['cost_p95'], '.4f'):>8} "
+                    f"{fmt(m['latency_p50']):>7} {fmt(m['latency_p95']):>7} "
+                    f"{fmt(m['latency_p99']):>7} {fmt(m['tokens_per_second'], '.1f'):>7}"
+                )
 
-            db.session.commit()
+    @app.cli.command("export")
+    @click.argument("output", type=click.Path(dir_okay=False, writable=True))
+    @click.option(
+        "--format",
+        "fmt",
+        type=click.Choice(list(EXPORT_FORMATS)),
+        default=None,
+        help="Output format; defaults to the OUTPUT file extension, then csv.",
+    )
+    @click.option(
+        "--columns",
+        default="",
+        help="Comma-separated columns to export (default: all but the long text). "
+        f"Available: {', '.join(EXPORT_COLUMNS)}.",
+    )
+    @click.option(
+        "--chunk-size",
+        type=click.IntRange(min=1),
+        default=DEFAULT_CHUNK_SIZE,
+        show_default=True,
+        help="Rows fetched and written per chunk; bounds memory use.",
+    )
+    def export(output, fmt, columns, chunk_size):
+        """Streams the article x assignment x LLM result join to a CSV, Parquet or Feather file."""
+        if fmt is None:
+            extension = os.path.splitext(output)[1].lstrip(".").lower()
+            fmt = extension if extension in EXPORT_FORMATS else "csv"
+        try:
+            columns = parse_columns(columns)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--columns")
+
+        with app.app_context():
+            start = time.perf_counter()
+            try:
+                with open(output, "wb") as f:
+                    rows = write_export(f, fmt, columns, chunk_size)
+            except ExportUnavailable as e:
+                os.remove(output)
+                raise click.ClickException(str(e))
+            elapsed = time.perf_counter() - start
             click.echo(
-                f"  - Successfully created {new_assignments_count} new assignments."
+                f"Exported {rows} rows x {len(columns)} columns to {output} ({fmt}) "
+                f"in {elapsed:.2f}s."
             )
-            click.echo("Assignment distribution:")
-            for v_id, count in sorted(load.items()):
-                user = User.query.get(v_id)
-                click.echo(f"  - {user.username}: {count} articles")
@@ -0,0 +1,18 @@
+import zlib
+
+# zlib ships with Python; level 6 is its usual speed/ratio balance
+COMPRESSION_LEVEL = 6
+
+
+def compress_text(text):
+    """Compresses a string to zlib bytes, passing None through."""
+    if text is None:
+        return None
+    return zlib.compress(text.encode("utf-8"), COMPRESSION_LEVEL)
+
+
+def decompress_text(blob):
+    """Inverse of compress_text."""
+    if blob is None:
+        return None
+    return zlib.decompress(blob).decode("utf-8")
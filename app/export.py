@@ -0,0 +1,172 @@
+import importlib.util
+import pandas as pd
+from app import db
+from app.models import User, Article, LLMResult, VerificationAssignment
+from app.usage import MICRO_DOLLARS
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "feather": ("application/vnd.apache.arrow.file", "feather"),
+}
+DEFAULT_CHUNK_SIZE = 5000
+
+# Column name -> (SQL expression, table it needs joined, pandas dtype).
+# Nullable pandas dtypes keep every chunk on the same Arrow schema, even when a
+# chunk happens to be all NULL in some column.
+EXPORT_COLUMNS = {
+    "article_id": (Article.id, None, "Int64"),
+    "doi": (Article.doi, None, "string"),
+    "title": (Article.title, None, "string"),
+    "abstract": (Article.abstract, None, "string"),
+    "year": (Article.year, None, "Int64"),
+    "source": (Article.source, None, "string"),
+    "reviewer": (User.username, "assignment", "string"),
+    "human_is_reviewed": (VerificationAssignment.is_reviewed, "assignment", "boolean"),
+    "human_is_relevant": (VerificationAssignment.is_relevant, "assignment", "boolean"),
+    "llm_model": (LLMResult.llm_model_name, "llm", "string"),
+    "llm_success": (LLMResult.success, "llm", "boolean"),
+    "llm_is_relevant": (LLMResult.is_relevant, "llm", "boolean"),
+    "llm_addressed_areas": (LLMResult._addressed_areas, "llm", "string"),
+    "llm_justification": (LLMResult.justification, "llm", "string"),
+    "llm_duration": (LLMResult.duration, "llm", "Float64"),
+    "llm_tokens_in": (LLMResult.tokens_in, "llm", "Int64"),
+    "llm_tokens_out": (LLMResult.tokens_out, "llm", "Int64"),
+    "llm_cost_usd": (
+        (
+            db.func.coalesce(LLMResult.num_token_in, 0)
+            + db.func.coalesce(LLMResult.num_token_out, 0)
+        )
+        / float(MICRO_DOLLARS),
+        "llm",
+        "Float64",
+    ),
+}
+DEFAULT_COLUMNS = [
+    name
+    for name in EXPORT_COLUMNS
+    if name not in ("abstract", "llm_addressed_areas", "llm_justification")
+]
+
+
+class ExportUnavailable(RuntimeError):
+    """Raised when a columnar format is requested but pyarrow is not installed."""
+
+
+def parse_columns(value):
+    """
+    Turns a comma-separated string or a list of names into a validated column list.
+    Returns the default columns when value is empty; raises ValueError on unknown names.
+    """
+    if isinstance(value, str):
+        value = value.split(",")
+    names = [name.strip() for name in value or [] if name.strip()]
+    if not names:
+        return list(DEFAULT_COLUMNS)
+    unknown = [name for name in names if name not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown export column(s): {', '.join(unknown)}")
+    return names
+
+
+def build_export_query(columns):
+    """
+    Selects only the requested columns from articles outer-joined to their
+    assignments and LLM results. A table is only joined when one of its columns
+    is requested, so article-only exports have one row per article, and so on.
+    """
+    joins = {EXPORT_COLUMNS[name][1] for name in columns}
+    query = db.select(
+        *(EXPORT_COLUMNS[name][0].label(name) for name in columns)
+    ).select_from(Article)
+    order_by = [Article.id]
+    if "assignment" in joins:
+        query = query.outerjoin(
+            VerificationAssignment, VerificationAssignment.article_id == Article.id
+        ).outerjoin(User, User.id == VerificationAssignment.user_id)
+        order_by.append(VerificationAssignment.id)
+    if "llm" in joins:
+        query = query.outerjoin(LLMResult, LLMResult.article_id == Article.id)
+        order_by.append(LLMResult.id)
+    return query.order_by(*order_by)
+
+
+def iter_export_frames(columns, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Streams the export as DataFrames of at most chunk_size rows. Rows are fetched
+    from one cursor with yield_per, so memory stays bounded by the chunk size.
+    Always yields at least one (possibly empty) frame so writers get a schema.
+    """
+    dtypes = {name: EXPORT_COLUMNS[name][2] for name in columns}
+    result = db.session.execute(
+        build_export_query(columns).execution_options(yield_per=chunk_size)
+    )
+    yielded = False
+    for rows in result.partitions():
+        yield pd.DataFrame(rows, columns=columns).astype(dtypes)
+        yielded = True
+    if not yielded:
+        yield pd.DataFrame(columns=columns).astype(dtypes)
+
+
+def iter_csv(columns, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yields the export as CSV text, one chunk at a time, header first."""
+    for index, frame in enumerate(iter_export_frames(columns, chunk_size)):
+        yield frame.to_csv(index=False, header=index == 0)
+
+
+def available_formats():
+    """The export formats whose writer can be imported here; CSV always, the rest with pyarrow."""
+    if importlib.util.find_spec("pyarrow") is not None:
+        return dict(EXPORT_FORMATS)
+    return {"csv": EXPORT_FORMATS["csv"]}
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ExportUnavailable(
+            "Parquet and Feather exports need pyarrow; install it with 'pip install pyarrow'."
+        ) from None
+    return pyarrow
+
+
+def write_export(fileobj, fmt, columns, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Writes the export to a binary file object in the given format and returns the
+    number of rows written. Parquet files get one row group per chunk; Feather
+    files one record batch per chunk.
+    """
+    if fmt == "csv":
+        rows = 0
+        for index, frame in enumerate(iter_export_frames(columns, chunk_size)):
+            fileobj.write(frame.to_csv(index=False, header=index == 0).encode())
+            rows += len(frame)
+        return rows
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'")
+
+    pa = _require_pyarrow()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        open_writer = pq.ParquetWriter
+    else:
+        import pyarrow.ipc
+
+        open_writer = pa.ipc.new_file
+
+    rows = 0
+    writer = None
+    try:
+        for frame in iter_export_frames(columns, chunk_size):
+            batch = pa.Table.from_pandas(frame, preserve_index=False)
+            if writer is None:
+                writer = open_writer(fileobj, batch.schema)
+            writer.write_table(batch)
+            rows += len(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
+from app import db
+from app.models import User
+
+_USER_COLUMNS = ("id", "username", "password_hash", "role")
+
+
+class UserCache:
+    """
+    Thread-safe TTL + LRU cache of User column values keyed by user ID.
+    Plain dicts are cached rather than instances, so nothing is shared between
+    sessions. ORM updates and deletes of a User in this process drop its entry at
+    once. Nothing can reach the caches of other processes, so for changes made
+    elsewhere (e.g. "flask seed-users", which always runs in its own process)
+    the TTL is the only invalidation.
+    """
+
+    def __init__(self, maxsize=256, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, values = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return values
+
+    def put(self, user_id, values):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id=None):
+        """Drops one user, or every user when user_id is None."""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+def init_user_cache(app):
+    app.extensions["user_cache"] = UserCache(
+        maxsize=app.config.get("USER_CACHE_SIZE", 256),
+        ttl=app.config.get("USER_CACHE_TTL", 60),
+    )
+
+
+def invalidate_user_cache(user_id=None):
+    """Forgets cached users for the current app; a no-op outside an app context."""
+    if has_app_context() and "user_cache" in current_app.extensions:
+        current_app.extensions["user_cache"].invalidate(user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target):
+    invalidate_user_cache(target.id)
+
+
+def load_cached_user(user_id):
+    """
+    Flask-Login user loader. A cache hit rebuilds a detached User from the cached
+    columns and attaches it to the session without a query, so lazy relationships
+    such as assignments keep working.
+    """
+    cache = current_app.extensions["user_cache"]
+    values = cache.get(user_id)
+    if values is None:
+        user = db.session.get(User, user_id)
+        if user is not None:
+            cache.put(
+                user_id, {column: getattr(user, column) for column in _USER_COLUMNS}
+            )
+        return user
+    user = User(**values)
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
@@ -0,0 +1,114 @@
+import json
+import os
+import pickle
+import re
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from app.compression import compress_text
+
+MEMBER_PATTERN = re.compile(r"res-(\d+)\.pkl$")
+
+
+def article_id_for_member(filename):
+    """Returns the article ID encoded in a zip member name, or None to skip it."""
+    if filename.startswith("__MACOSX/") or filename.endswith("/"):
+        return None
+    match = MEMBER_PATTERN.search(filename)
+    if not match:
+        return None
+    return int(match.group(1)) + 1
+
+
+def decode_llm_result(payload, model_name, cost_in, cost_out):
+    """
+    Unpickles a single result file into a row dict for a bulk LLMResult insert.
+    Runs inside worker processes, so it must stay a picklable module-level function;
+    compressing raw here keeps that CPU work off the main process too.
+    """
+    article_id, blob = payload
+    data = pickle.loads(blob)
+
+    result_data = data.get("result", {})
+    usage_data = data.get("usage", {})
+    addressed_areas = result_data.get("addressed_areas")
+
+    return {
+        "success": data.get("success", False),
+        "_raw_compressed": compress_text(data.get("raw")),
+        "is_relevant": result_data.get("is_relevant"),
+        "_addressed_areas": encode_addressed_areas(addressed_areas),
+        "justification": result_data.get("justification"),
+        "duration": usage_data.get("duration"),
+        "num_token_in": usage_data.get("num_token_in", 0) * cost_in,
+        "num_token_out": usage_data.get("num_token_out", 0) * cost_out,
+        "tokens_in": usage_data.get("num_token_in"),
+        "tokens_out": usage_data.get("num_token_out"),
+        "llm_model_name": model_name,
+        "article_id": article_id,
+    }
+
+
+def try_decode_llm_result(payload, model_name, cost_in, cost_out):
+    """
+    Like decode_llm_result, but returns (article_id, error message) instead of
+    raising, so one corrupt member cannot fail the whole batch.
+    """
+    try:
+        return decode_llm_result(payload, model_name, cost_in, cost_out)
+    except Exception as e:
+        return payload[0], f"{type(e).__name__}: {e}"
+
+
+def encode_addressed_areas(value):
+    """Mirrors the LLMResult.addressed_areas setter for rows inserted in bulk."""
+    return json.dumps(value) if value else None
+
+
+def iter_batches(items, batch_size):
+    """Yields consecutive slices of at most batch_size items."""
+    for start in range(0, len(items), batch_size):
+        yield items[start : start + batch_size]
+
+
+class ResultDecoder:
+    """
+    Decodes pickled results either inline or in a process pool.
+    Use as a context manager so the pool is shut down when ingestion ends.
+    """
+
+    def __init__(self, model_name, cost_in, cost_out, workers=None):
+        self.decode = partial(
+            try_decode_llm_result,
+            model_name=model_name,
+            cost_in=cost_in,
+            cost_out=cost_out,
+        )
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.executor = None
+
+    def __enter__(self):
+        if self.workers > 1:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def map(self, payloads):
+        """
+        Decodes a batch of (article_id, pickle bytes) pairs. Returns (rows, failed)
+        where rows are the row dicts and failed lists (article_id, error message)
+        for payloads that could not be decoded.
+        """
+        if self.executor is None:
+            results = [self.decode(payload) for payload in payloads]
+        else:
+            chunksize = max(1, len(payloads) // (self.workers * 4))
+            results = list(
+                self.executor.map(self.decode, payloads, chunksize=chunksize)
+            )
+        rows = [result for result in results if isinstance(result, dict)]
+        failed = [result for result in results if not isinstance(result, dict)]
+        return rows, failed
@@ -0,0 +1,159 @@
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+import numpy as np
+from flask import before_render_template, g, has_app_context, request, template_rendered
+from sqlalchemy import event
+
+
+class EndpointStats:
+    """Running totals for one endpoint plus a window of recent request durations."""
+
+    def __init__(self, window):
+        self.requests = 0
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.render_ms = 0.0
+        self.total_ms = 0.0
+        self.max_queries = 0
+        self.recent_ms = deque(maxlen=window)
+
+    def summary(self):
+        recent = np.asarray(self.recent_ms, dtype=float)
+        p50, p95 = np.percentile(recent, [50, 95]) if recent.size else (None, None)
+        return {
+            "requests": self.requests,
+            "queries_per_request": self.queries / self.requests,
+            "max_queries": self.max_queries,
+            "sql_ms": self.sql_ms / self.requests,
+            "render_ms": self.render_ms / self.requests,
+            "total_ms": self.total_ms / self.requests,
+            "p50_ms": None if p50 is None else float(p50),
+            "p95_ms": None if p95 is None else float(p95),
+        }
+
+
+class RequestMetrics:
+    """
+    Collects per-endpoint query counts, SQL time, template render time and slow
+    statements. Timings for the current request accumulate on flask.g and are
+    folded into the shared totals when the request ends.
+    """
+
+    def __init__(self, slow_query_ms=100, window=500, slow_log_size=50):
+        self.slow_query_ms = slow_query_ms
+        self.window = window
+        self.started_at = datetime.now(timezone.utc)
+        self.endpoints = {}
+        self.slow_queries = deque(maxlen=slow_log_size)
+        self._lock = threading.Lock()
+
+    def _current(self):
+        return g.get("request_timing") if has_app_context() else None
+
+    # --- SQLAlchemy engine events ---
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, many):
+        # Kept on the execution context, which is discarded with the statement even
+        # when it raises and after_cursor_execute never runs
+        context._query_start = time.perf_counter()
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, many):
+        elapsed_ms = (time.perf_counter() - context._query_start) * 1000
+        timing = self._current()
+        if timing is None:
+            return
+        timing["queries"] += 1
+        timing["sql_ms"] += elapsed_ms
+        if elapsed_ms >= self.slow_query_ms:
+            with self._lock:
+                self.slow_queries.appendleft(
+                    {
+                        "endpoint": request.endpoint,
+                        "ms": elapsed_ms,
+                        "statement": " ".join(statement.split())[:500],
+                        "at": datetime.now(timezone.utc),
+                    }
+                )
+
+    # --- Template signals ---
+
+    def before_render(self, sender, template, context, **extra):
+        timing = self._current()
+        if timing is not None:
+            timing["render_start"] = time.perf_counter()
+
+    def after_render(self, sender, template, context, **extra):
+        timing = self._current()
+        if timing is not None and "render_start" in timing:
+            start = timing.pop("render_start")
+            timing["render_ms"] += (time.perf_counter() - start) * 1000
+
+    # --- Request hooks ---
+
+    def start_request(self):
+        g.request_timing = {
+            "start": time.perf_counter(),
+            "queries": 0,
+            "sql_ms": 0.0,
+            "render_ms": 0.0,
+        }
+
+    def finish_request(self, response):
+        timing = g.pop("request_timing", None)
+        if timing is None:
+            return response
+        total_ms = (time.perf_counter() - timing["start"]) * 1000
+        response.headers["Server-Timing"] = (
+            f'db;dur={timing["sql_ms"]:.1f};desc="{timing["queries"]} queries", '
+            f'render;dur={timing["render_ms"]:.1f}, total;dur={total_ms:.1f}'
+        )
+        endpoint = request.endpoint or "<unmatched>"
+        with self._lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                stats = self.endpoints[endpoint] = EndpointStats(self.window)
+            stats.requests += 1
+            stats.queries += timing["queries"]
+            stats.sql_ms += timing["sql_ms"]
+            stats.render_ms += timing["render_ms"]
+            stats.total_ms += total_ms
+            stats.max_queries = max(stats.max_queries, timing["queries"])
+            stats.recent_ms.append(total_ms)
+        return response
+
+    def snapshot(self):
+        """Per-endpoint summaries (slowest average first) and recent slow statements."""
+        with self._lock:
+            endpoints = [
+                dict(endpoint=name, **stats.summary())
+                for name, stats in self.endpoints.items()
+            ]
+            slow_queries = list(self.slow_queries)
+        endpoints.sort(key=lambda row: row["total_ms"], reverse=True)
+        return endpoints, slow_queries
+
+    def reset(self):
+        with self._lock:
+            self.endpoints.clear()
+            self.slow_queries.clear()
+            self.started_at = datetime.now(timezone.utc)
+
+
+def install_instrumentation(app, engine):
+    """Hooks RequestMetrics into the engine, templates and requests when INSTRUMENTATION is on."""
+    if not app.config.get("INSTRUMENTATION"):
+        return None
+    metrics = RequestMetrics(
+        slow_query_ms=app.config.get("SLOW_QUERY_MS", 100),
+        window=app.config.get("METRICS_WINDOW", 500),
+    )
+    event.listen(engine, "before_cursor_execute", metrics.before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", metrics.after_cursor_execute)
+    before_render_template.connect(metrics.before_render, app)
+    template_rendered.connect(metrics.after_render, app)
+    app.before_request(metrics.start_request)
+    app.after_request(metrics.finish_request)
+    app.extensions["request_metrics"] = metrics
+    return metrics
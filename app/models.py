@@ -1,7 +1,9 @@
 from app import db
+from app.compression import compress_text, decompress_text
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
-from sqlalchemy import UniqueConstraint
+from app.security import hash_password, password_needs_rehash, verify_password
+from sqlalchemy import Index, UniqueConstraint
+from datetime import datetime, timezone
 import json
 
 
@@ -18,10 +20,14 @@ class User(UserMixin, db.Model):
     )
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        """True if the stored hash predates the configured hash parameters."""
+        return password_needs_rehash(self.password_hash)
 
 
 class Article(db.Model):
@@ -30,7 +36,8 @@ class Article(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     doi = db.Column(db.String(120), nullable=True)
     title = db.Column(db.Text, nullable=True)
-    abstract = db.Column(db.Text, nullable=True)
+    # Large text is deferred; views that render it opt in with undefer()
+    abstract = db.deferred(db.Column(db.Text, nullable=True))
     year = db.Column(db.Integer, nullable=True)
     source = db.Column(db.String(100), nullable=True)
 
@@ -50,10 +57,41 @@ class VerificationAssignment(db.Model):
     article_id = db.Column(db.Integer, db.ForeignKey("article.id"), nullable=False)
     is_relevant = db.Column(db.Boolean, nullable=True, default=None)
     is_reviewed = db.Column(db.Boolean, nullable=False, default=False)
+    # Bumped on every change to the review; feeds the dashboard ETag
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1")
 
-    # Ensures a user can only be assigned to the same article once
+    # Ensures a user can only be assigned to the same article once.
+    # The unique index also serves per-user lookups ordered by article_id;
+    # the composite index covers "first unreviewed" and reviewed counts per user.
     __table_args__ = (
         UniqueConstraint("user_id", "article_id", name="_user_article_uc"),
+        Index(
+            "ix_assignment_user_reviewed_article",
+            "user_id",
+            "is_reviewed",
+            "article_id",
+        ),
+        Index("ix_assignment_article", "article_id"),
+    )
+
+
+class ReviewProgress(db.Model):
+    """Cached reviewed/total assignment counts, one row per verificator plus a global row."""
+
+    scope = db.Column(db.String(40), primary_key=True)
+    reviewed_count = db.Column(db.Integer, nullable=False, default=0)
+    total_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class AnalysisSnapshot(db.Model):
+    """Materialized chart payload for the analysis page, keyed by chart name."""
+
+    name = db.Column(db.String(50), primary_key=True)
+    # Bumped on every invalidation; a payload is only stored against the version it was built for
+    version = db.Column(db.Integer, nullable=False, default=1)
+    payload = db.Column(db.Text, nullable=True)
+    built_at = db.Column(
+        db.DateTime, nullable=True, default=lambda: datetime.now(timezone.utc)
     )
 
 
@@ -62,26 +100,98 @@ class LLMResult(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     success = db.Column(db.Boolean, nullable=False)
-    raw = db.Column(db.Text, nullable=True)
+    # Large text is deferred; raw is never rendered, justification only on the dashboard.
+    # raw is stored zlib-compressed; the text column only holds legacy, uncompressed rows.
+    _raw_text = db.deferred(db.Column("raw", db.Text, nullable=True))
+    _raw_compressed = db.deferred(
+        db.Column("raw_compressed", db.LargeBinary, nullable=True)
+    )
     is_relevant = db.Column(db.Boolean, nullable=True)
     _addressed_areas = db.Column("addressed_areas", db.Text, nullable=True)
-    justification = db.Column(db.Text, nullable=True)
+    justification = db.deferred(db.Column(db.Text, nullable=True))
     duration = db.Column(db.Float, nullable=True)
+    # seed-llm stores token count x price per 1M tokens here, i.e. micro-dollars
     num_token_in = db.Column(db.Integer, nullable=True)
     num_token_out = db.Column(db.Integer, nullable=True)
+    # Plain token counts, kept for throughput statistics
+    tokens_in = db.Column(db.Integer, nullable=True)
+    tokens_out = db.Column(db.Integer, nullable=True)
     llm_model_name = db.Column(db.String(100), nullable=False)
 
     article_id = db.Column(db.Integer, db.ForeignKey("article.id"), nullable=False)
+    # The unique index serves lookups by article_id; the model index serves seed-llm
     __table_args__ = (
         UniqueConstraint("article_id", "llm_model_name", name="_article_model_uc"),
+        Index("ix_llm_result_model_article", "llm_model_name", "article_id"),
+    )
+
+    area_rows = db.relationship(
+        "AddressedArea", backref="llm_result", lazy=True, cascade="all, delete-orphan"
     )
 
+    @property
+    def raw(self):
+        if self._raw_compressed is not None:
+            return decompress_text(self._raw_compressed)
+        return self._raw_text
+
+    @raw.setter
+    def raw(self, value):
+        self._raw_compressed = compress_text(value)
+        self._raw_text = None
+
     @property
     def addressed_areas(self):
-        if self._addressed_areas:
-            return json.loads(self._addressed_areas)
-        return []
+        # Decode once per instance; the cache is keyed on the stored JSON text
+        cached = getattr(self, "_addressed_areas_cache", None)
+        if cached is not None and cached[0] == self._addressed_areas:
+            return cached[1]
+        areas = json.loads(self._addressed_areas) if self._addressed_areas else []
+        self._addressed_areas_cache = (self._addressed_areas, areas)
+        return areas
 
     @addressed_areas.setter
     def addressed_areas(self, value):
         self._addressed_areas = json.dumps(value) if value else None
+
+
+class AddressedArea(db.Model):
+    """One row per area an LLM result addresses, so area statistics can run in SQL."""
+
+    id = db.Column(db.Integer, primary_key=True)
+    llm_result_id = db.Column(
+        db.Integer, db.ForeignKey("llm_result.id"), nullable=False
+    )
+    area = db.Column(db.String(200), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("llm_result_id", "area", name="_result_area_uc"),
+        Index("ix_addressed_area_area", "area"),
+    )
+
+
+class IngestCheckpoint(db.Model):
+    """Records the last zip member ingested per (archive, model) so seed-llm can resume."""
+
+    id = db.Column(db.Integer, primary_key=True)
+    archive = db.Column(db.String(255), nullable=False)
+    archive_size = db.Column(db.Integer, nullable=False)
+    llm_model_name = db.Column(db.String(100), nullable=False)
+    member_index = db.Column(db.Integer, nullable=False, default=-1)
+    last_member = db.Column(db.String(255), nullable=True)
+    completed = db.Column(db.Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        UniqueConstraint("archive", "llm_model_name", name="_archive_model_uc"),
+    )
+
+    def resume_index(self, names):
+        """Returns the namelist position to continue from, or 0 if the archive changed."""
+        if self.last_member is None:
+            return 0
+        if (
+            self.member_index < len(names)
+            and names[self.member_index] == self.last_member
+        ):
+            return self.member_index + 1
+        return 0
@@ -0,0 +1,73 @@
+from sqlalchemy import case, func
+from app import db
+from app.models import ReviewProgress, VerificationAssignment
+
+GLOBAL_SCOPE = "global"
+
+
+def user_scope(user_id):
+    """Returns the ReviewProgress key for a single verificator."""
+    return f"user:{user_id}"
+
+
+def rebuild_progress():
+    """Recomputes every counter from the assignments table with one grouped query."""
+    rows = db.session.execute(
+        db.select(
+            VerificationAssignment.user_id,
+            func.count(),
+            func.sum(case((VerificationAssignment.is_reviewed, 1), else_=0)),
+        ).group_by(VerificationAssignment.user_id)
+    ).all()
+
+    counters = [
+        {
+            "scope": user_scope(user_id),
+            "reviewed_count": reviewed or 0,
+            "total_count": total,
+        }
+        for user_id, total, reviewed in rows
+    ]
+    counters.append(
+        {
+            "scope": GLOBAL_SCOPE,
+            "reviewed_count": sum(c["reviewed_count"] for c in counters),
+            "total_count": sum(c["total_count"] for c in counters),
+        }
+    )
+
+    db.session.execute(db.delete(ReviewProgress))
+    db.session.execute(db.insert(ReviewProgress), counters)
+    db.session.commit()
+
+
+def get_progress(user):
+    """
+    Returns (reviewed_count, total_count) for the header counter.
+    Admins see the global counter, verificators their own; both are a primary-key lookup.
+    """
+    scope = GLOBAL_SCOPE if user.role == "admin" else user_scope(user.id)
+    progress = db.session.get(ReviewProgress, scope)
+    if progress is None:
+        if db.session.get(ReviewProgress, GLOBAL_SCOPE) is not None:
+            # Counters exist, this user simply has no assignments
+            return 0, 0
+        rebuild_progress()
+        progress = db.session.get(ReviewProgress, scope)
+        if progress is None:
+            return 0, 0
+    return progress.reviewed_count, progress.total_count
+
+
+def record_reviews(user_id, count=1):
+    """
+    Bumps the user and global reviewed counters for assignments that were just
+    marked reviewed for the first time. Runs in the caller's transaction.
+    """
+    if not count:
+        return
+    db.session.execute(
+        db.update(ReviewProgress)
+        .where(ReviewProgress.scope.in_([user_scope(user_id), GLOBAL_SCOPE]))
+        .values(reviewed_count=ReviewProgress.reviewed_count + count)
+    )
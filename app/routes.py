@@ -1,6 +1,10 @@
-from collections import defaultdict
+import hashlib
+import tempfile
 from flask import (
+    current_app,
     json,
+    make_response,
+    session,
     render_template,
     redirect,
     url_for,
@@ -8,14 +12,114 @@ from flask import (
     request,
     Blueprint,
     abort,
+    jsonify,
+    Response,
+    send_file,
+    stream_with_context,
 )
 from flask_login import login_user, logout_user, login_required, current_user
-from app.models import User, Article, VerificationAssignment
+from app.models import User, Article, LLMResult, VerificationAssignment
+from app.analysis import (
+    AGREEMENT_STATS,
+    LLM_CHART,
+    USAGE_STATS,
+    VERIFICATOR_CHART,
+    get_chart_data,
+    invalidate_analysis,
+)
+from app.export import (
+    DEFAULT_COLUMNS,
+    EXPORT_COLUMNS,
+    EXPORT_FORMATS,
+    ExportUnavailable,
+    available_formats,
+    iter_csv,
+    parse_columns,
+    write_export,
+)
+from app.assignment_list import AGREEMENT_CHOICES, list_assignments
+from app.progress import get_progress, record_reviews
+from app.search import search_articles, search_index_exists
+from app.usage import MICRO_DOLLARS
+from app.verification import apply_decisions, first_unreviewed_article_id
 from app import db
 
 bp = Blueprint("main", __name__)
 
 
+def _navigation_query():
+    """Returns the ordered article ID column and base query for the current user's queue."""
+    if current_user.role == "admin":
+        return Article.id, db.session.query(Article.id)
+    column = VerificationAssignment.article_id
+    return column, db.session.query(column).filter(
+        VerificationAssignment.user_id == current_user.id
+    )
+
+
+def _neighbour_article_ids(article_id):
+    """Finds the previous and next article IDs with two indexed LIMIT 1 queries."""
+    column, query = _navigation_query()
+    prev_id = (
+        query.filter(column < article_id).order_by(column.desc()).limit(1).scalar()
+    )
+    next_id = query.filter(column > article_id).order_by(column).limit(1).scalar()
+    return prev_id, next_id
+
+
+def _current_assignment(article_id):
+    """The current verificator's assignment for an article; aborts 403 if there is none."""
+    if current_user.role != "verificator":
+        return None
+    assignment = current_user.assignments.filter_by(article_id=article_id).first()
+    if not assignment:
+        abort(403)
+    return assignment
+
+
+def _article_etag(article_id, assignment, prev_id, next_id, progress):
+    """
+    Derives an ETag for an article view from cheap, indexed lookups only: the
+    assignment version, the LLM result IDs (results are never edited in place),
+    navigation and progress. Aborts 404 if the article does not exist.
+    """
+    result_ids = db.session.scalars(
+        db.select(LLMResult.id)
+        .where(LLMResult.article_id == article_id)
+        .order_by(LLMResult.id)
+    ).all()
+    if assignment is None and not result_ids:
+        if db.session.scalar(db.select(Article.id).filter_by(id=article_id)) is None:
+            abort(404)
+    parts = (
+        current_user.id,
+        article_id,
+        (assignment.id, assignment.version) if assignment else None,
+        result_ids,
+        prev_id,
+        next_id,
+        progress,
+    )
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def _not_modified(etag):
+    """A bodiless 304 when the client already holds this version, otherwise None."""
+    if etag not in request.if_none_match:
+        return None
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _load_article(article_id):
+    return Article.query.options(
+        db.undefer(Article.abstract),
+        db.joinedload(Article.llm_results).undefer(LLMResult.justification),
+    ).get_or_404(article_id)
+
+
 @bp.route("/")
 @bp.route("/login", methods=["GET", "POST"])
 def login():
@@ -26,6 +130,9 @@ def login():
         password = request.form.get("password")
         user = User.query.filter_by(username=username).first()
         if user and user.check_password(password):
+            if user.password_needs_rehash():
+                user.set_password(password)
+                db.session.commit()
             login_user(user)
             return redirect(url_for("main.dashboard_redirect"))
         else:
@@ -44,36 +151,21 @@ def dashboard_redirect():
         if first_article:
             first_article_id = first_article.id
     else:  # Verificator
-        first_unreviewed = (
-            current_user.assignments.filter_by(is_reviewed=False)
-            .order_by(VerificationAssignment.article_id)
-            .first()
-        )
-        if first_unreviewed:
-            first_article_id = first_unreviewed.article_id
-        else:  # All articles are reviewed, go to the first one in their list
-            first_assigned = current_user.assignments.order_by(
-                VerificationAssignment.article_id
-            ).first()
-            if first_assigned:
-                first_article_id = first_assigned.article_id
+        first_article_id = first_unreviewed_article_id(current_user.id)
+        if not first_article_id:
+            # All articles are reviewed, go to the first one in their list
+            first_article_id = db.session.scalar(
+                db.select(VerificationAssignment.article_id)
+                .where(VerificationAssignment.user_id == current_user.id)
+                .order_by(VerificationAssignment.article_id)
+                .limit(1)
+            )
 
     if first_article_id:
         return redirect(url_for("main.dashboard", article_id=first_article_id))
     else:
         # Handle case where there are no articles to show
-        reviewed_count = 0
-        total_count = 0
-        if current_user.role == "admin":
-            total_count = VerificationAssignment.query.count()
-            reviewed_count = VerificationAssignment.query.filter_by(
-                is_reviewed=True
-            ).count()
-        else:  # Verificator
-            total_count = current_user.assignments.count()
-            reviewed_count = current_user.assignments.filter_by(
-                is_reviewed=True
-            ).count()
+        reviewed_count, total_count = get_progress(current_user)
 
         if total_count > 0 and reviewed_count == total_count:
             flash(
@@ -97,60 +189,99 @@ def dashboard_redirect():
 @login_required
 def dashboard(article_id):
     """Displays an article and calculates progress stats."""
-    assignment = None
-    if current_user.role == "verificator":
-        assignment = current_user.assignments.filter_by(article_id=article_id).first()
-        if not assignment:
-            abort(403)
-
-    article = Article.query.options(db.joinedload(Article.llm_results)).get_or_404(
-        article_id
-    )
+    assignment = _current_assignment(article_id)
 
     # --- Counter Logic ---
-    reviewed_count = 0
-    total_count = 0
-    if current_user.role == "admin":
-        # Admin sees overall progress of all assignments in the system
-        total_count = VerificationAssignment.query.count()
-        reviewed_count = VerificationAssignment.query.filter_by(
-            is_reviewed=True
-        ).count()
-    else:  # Verificator
-        # Verificator sees their personal progress
-        total_count = current_user.assignments.count()
-        reviewed_count = current_user.assignments.filter_by(is_reviewed=True).count()
+    # Admin sees overall progress, verificator their personal progress
+    reviewed_count, total_count = get_progress(current_user)
 
     # --- Navigation Logic ---
-    assigned_ids = []
-    if current_user.role == "admin":
-        assigned_ids = [a.id for a in Article.query.order_by(Article.id).all()]
-    else:
-        assignments = current_user.assignments.order_by(
-            VerificationAssignment.article_id
-        ).all()
-        assigned_ids = [a.article_id for a in assignments]
+    prev_id, next_id = _neighbour_article_ids(article_id)
 
-    try:
-        current_index = assigned_ids.index(article_id)
-        prev_id = assigned_ids[current_index - 1] if current_index > 0 else None
-        next_id = (
-            assigned_ids[current_index + 1]
-            if current_index < len(assigned_ids) - 1
-            else None
+    # Pending flash messages are part of the page, so only cache clean renders
+    etag = _article_etag(
+        article_id, assignment, prev_id, next_id, (reviewed_count, total_count)
+    )
+    if "_flashes" not in session:
+        not_modified = _not_modified(etag)
+        if not_modified is not None:
+            return not_modified
+
+    response = make_response(
+        render_template(
+            "dashboard.html",
+            article=_load_article(article_id),
+            assignment=assignment,
+            prev_id=prev_id,
+            next_id=next_id,
+            reviewed_count=reviewed_count,
+            total_count=total_count,
         )
-    except ValueError:
-        current_index, prev_id, next_id = -1, None, None
+    )
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
 
-    return render_template(
-        "dashboard.html",
-        article=article,
-        assignment=assignment,
+
+@bp.route("/api/articles/<int:article_id>")
+@login_required
+def article_api(article_id):
+    """
+    JSON view of an article with its LLM results, the user's assignment and
+    navigation. Supports If-None-Match; the ETag is checked before any heavy
+    content is loaded.
+    """
+    assignment = _current_assignment(article_id)
+    reviewed_count, total_count = get_progress(current_user)
+    prev_id, next_id = _neighbour_article_ids(article_id)
+    etag = _article_etag(
+        article_id, assignment, prev_id, next_id, (reviewed_count, total_count)
+    )
+    not_modified = _not_modified(etag)
+    if not_modified is not None:
+        return not_modified
+
+    article = _load_article(article_id)
+    response = jsonify(
+        article={
+            "id": article.id,
+            "doi": article.doi,
+            "title": article.title,
+            "abstract": article.abstract,
+            "year": article.year,
+            "source": article.source,
+        },
+        assignment=(
+            {
+                "id": assignment.id,
+                "is_reviewed": assignment.is_reviewed,
+                "is_relevant": assignment.is_relevant,
+                "version": assignment.version,
+            }
+            if assignment
+            else None
+        ),
+        llm_results=[
+            {
+                "model": result.llm_model_name,
+                "success": result.success,
+                "is_relevant": result.is_relevant,
+                "justification": result.justification,
+                "addressed_areas": result.addressed_areas,
+                "duration": result.duration,
+                "cost_usd": ((result.num_token_in or 0) + (result.num_token_out or 0))
+                / MICRO_DOLLARS,
+            }
+            for result in article.llm_results
+        ],
         prev_id=prev_id,
         next_id=next_id,
         reviewed_count=reviewed_count,
         total_count=total_count,
     )
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
 
 
 @bp.route("/verify/<int:article_id>", methods=["POST"])
@@ -169,24 +300,106 @@ def submit_verification(article_id):
             "warning",
         )
         return redirect(url_for("main.dashboard", article_id=article_id))
-    assignment.is_relevant = decision == "true"
-    assignment.is_reviewed = True
+    this_assignment = (
+        VerificationAssignment.user_id == current_user.id,
+        VerificationAssignment.article_id == article_id,
+    )
+    # Only the request that flips is_reviewed counts the review, so double or
+    # concurrent submits of the same assignment cannot inflate the counters
+    newly_reviewed = db.session.execute(
+        db.update(VerificationAssignment)
+        .where(*this_assignment, VerificationAssignment.is_reviewed.is_(False))
+        .values(is_reviewed=True)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    record_reviews(current_user.id, newly_reviewed)
+    invalidate_analysis(VERIFICATOR_CHART, AGREEMENT_STATS)
+    db.session.execute(
+        db.update(VerificationAssignment)
+        .where(*this_assignment)
+        .values(
+            is_relevant=decision == "true",
+            version=VerificationAssignment.version + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
     db.session.commit()
     flash(f"Verification for article #{article_id} saved successfully.", "success")
-    assignments = current_user.assignments.order_by(
-        VerificationAssignment.article_id
-    ).all()
-    assigned_ids = [a.article_id for a in assignments]
-    try:
-        current_index = assigned_ids.index(article_id)
-        if current_index < len(assigned_ids) - 1:
-            next_id = assigned_ids[current_index + 1]
-            return redirect(url_for("main.dashboard", article_id=next_id))
-    except ValueError:
-        pass
+    _, next_id = _neighbour_article_ids(article_id)
+    if next_id:
+        return redirect(url_for("main.dashboard", article_id=next_id))
     return redirect(url_for("main.dashboard_redirect"))
 
 
+def _batch_decisions():
+    """
+    Reads {article_id: is_relevant} from a JSON body ({"decisions": {"12": true}})
+    or from form fields named decision-<article_id> with "true"/"false" values.
+    Raises ValueError on malformed input.
+    """
+    if request.is_json:
+        payload = request.get_json(silent=True) or {}
+        raw = payload.get("decisions")
+        if not isinstance(raw, dict):
+            raise ValueError('Expected {"decisions": {"<article_id>": true|false}}.')
+        items = raw.items()
+    else:
+        items = [
+            (key.removeprefix("decision-"), {"true": True, "false": False}.get(value))
+            for key, value in request.form.items()
+            if key.startswith("decision-") and value
+        ]
+    decisions = {}
+    for article_id, decision in items:
+        if not isinstance(decision, bool) or not str(article_id).isdigit():
+            raise ValueError(f"Invalid decision for article '{article_id}'.")
+        decisions[int(article_id)] = decision
+    return decisions
+
+
+@bp.route("/verify/batch", methods=["POST"])
+@login_required
+def submit_batch_verification():
+    """
+    Applies many decisions in one transaction. JSON requests get the result,
+    progress and next unreviewed article back; form posts return to the list.
+    """
+    if current_user.role != "verificator":
+        if request.is_json:
+            return jsonify(error="Only verificators can submit reviews."), 403
+        flash("Only verificators can submit reviews.", "danger")
+        return redirect(url_for("main.assignment_list", **request.args))
+    try:
+        result = apply_decisions(current_user.id, _batch_decisions())
+    except ValueError as e:
+        if request.is_json:
+            return jsonify(error=str(e)), 400
+        flash(str(e), "danger")
+        return redirect(url_for("main.assignment_list", **request.args))
+
+    reviewed_count, total_count = get_progress(current_user)
+    next_article_id = first_unreviewed_article_id(current_user.id)
+    if request.is_json:
+        return jsonify(
+            **result,
+            reviewed_count=reviewed_count,
+            total_count=total_count,
+            next_article_id=next_article_id,
+        )
+
+    message = (
+        f"Saved {len(result['updated'])} decision(s) "
+        f"({len(result['newly_reviewed'])} newly reviewed). "
+        f"{reviewed_count} / {total_count} reviewed."
+    )
+    if result["unknown"]:
+        message += " Skipped unassigned article(s): " + ", ".join(
+            map(str, result["unknown"])
+        )
+    flash(message, "warning" if result["unknown"] else "success")
+    return redirect(url_for("main.assignment_list", **request.args))
+
+
 @bp.route("/analysis")
 @login_required
 def analysis():
@@ -194,101 +407,147 @@ def analysis():
     if current_user.role != "admin":
         abort(403)
 
-    # --- Chart 1: LLM Relevance Analysis ---
-    llm_analysis_data = defaultdict(lambda: defaultdict(int))
-    all_sources = set()
-    articles = Article.query.options(db.joinedload(Article.llm_results)).all()
-    total_articles = len(articles)
+    llm_chart_data = get_chart_data(LLM_CHART)
+    verificator_chart_data = get_chart_data(VERIFICATOR_CHART)
+    agreement = json.loads(get_chart_data(AGREEMENT_STATS))
+    usage_stats = json.loads(get_chart_data(USAGE_STATS))
 
-    if total_articles > 0:
-        for article in articles:
-            relevant_count = sum(
-                1 for result in article.llm_results if result.is_relevant
-            )
-            source = article.source or "Unknown"
-            llm_analysis_data[relevant_count][source] += 1
-            all_sources.add(source)
-
-    sorted_sources = sorted(list(all_sources))
-    llm_labels = sorted(llm_analysis_data.keys())
-    llm_datasets = []
-    colors = [
-        "rgba(67, 56, 202, 0.7)",
-        "rgba(219, 39, 119, 0.7)",
-        "rgba(245, 158, 11, 0.7)",
-        "rgba(16, 185, 129, 0.7)",
-        "rgba(99, 102, 241, 0.7)",
-    ]
-    for i, source in enumerate(sorted_sources):
-        data_points = [
-            (
-                (llm_analysis_data[label].get(source, 0) / total_articles) * 100
-                if total_articles > 0
-                else 0
-            )
-            for label in llm_labels
-        ]
-        raw_data_points = [
-            llm_analysis_data[label].get(source, 0) for label in llm_labels
-        ]
-        llm_datasets.append(
-            {
-                "label": source,
-                "data": data_points,
-                "raw_data": raw_data_points,
-                "backgroundColor": colors[i % len(colors)],
-            }
-        )
+    return render_template(
+        "analysis.html",
+        llm_chart_data=llm_chart_data,
+        verificator_chart_data=verificator_chart_data,
+        agreement=agreement,
+        usage_stats=usage_stats,
+        export_columns=EXPORT_COLUMNS,
+        default_columns=DEFAULT_COLUMNS,
+        export_formats=available_formats(),
+    )
 
-    llm_chart_data = {
-        "labels": [str(label) for label in llm_labels],
-        "datasets": llm_datasets,
-    }
 
-    # --- Chart 2: Verificator Progress Analysis ---
-    verificator_stats = []
-    verificators = User.query.filter_by(role="verificator").all()
-    for v in verificators:
-        total_assigned = v.assignments.count()
-        if total_assigned == 0:
-            continue
-        reviewed_count = v.assignments.filter_by(is_reviewed=True).count()
-        relevant_count = v.assignments.filter_by(
-            is_reviewed=True, is_relevant=True
-        ).count()
-        not_relevant_count = reviewed_count - relevant_count
-        percentage = (reviewed_count / total_assigned) * 100
-        verificator_stats.append(
-            {
-                "username": v.username,
-                "percentage": percentage,
-                "total_assigned": total_assigned,
-                "reviewed_count": reviewed_count,
-                "relevant_count": relevant_count,
-                "not_relevant_count": not_relevant_count,
-            }
+@bp.route("/export")
+@login_required
+def export():
+    """Downloads the review data; CSV is streamed, columnar formats go via a temp file."""
+    if current_user.role != "admin":
+        abort(403)
+    fmt = request.args.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        abort(400)
+    try:
+        columns = parse_columns(request.args.getlist("columns"))
+    except ValueError as e:
+        flash(str(e), "danger")
+        return redirect(url_for("main.analysis"))
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    download_name = f"slr-export.{extension}"
+
+    if fmt == "csv":
+        return Response(
+            stream_with_context(iter_csv(columns)),
+            mimetype=mimetype,
+            headers={"Content-Disposition": f"attachment; filename={download_name}"},
         )
 
-    sorted_stats = sorted(
-        verificator_stats, key=lambda x: x["percentage"], reverse=True
+    # Parquet/Feather footers need the whole file, so spool chunks to disk, not memory
+    f = tempfile.TemporaryFile()
+    try:
+        write_export(f, fmt, columns)
+    except ExportUnavailable as e:
+        f.close()
+        flash(str(e), "danger")
+        return redirect(url_for("main.analysis"))
+    f.seek(0)
+    return send_file(
+        f, mimetype=mimetype, as_attachment=True, download_name=download_name
     )
 
-    verificator_chart_data = {
-        "labels": [s["username"] for s in sorted_stats],
-        "datasets": [
-            {
-                "label": "Review Progress (%)",
-                "data": [s["percentage"] for s in sorted_stats],
-                "backgroundColor": "rgba(219, 39, 119, 0.7)",
-                "custom_data": sorted_stats,  # Pass all stats for the tooltip
-            }
-        ],
+
+def _assignment_filters():
+    """Reads the assignment list filters shared by the HTML view and the JSON API."""
+    reviewed = request.args.get("reviewed")
+    agreement = request.args.get("agreement")
+    return {
+        "reviewed": {"yes": True, "no": False}.get(reviewed),
+        "source": request.args.get("source", "").strip() or None,
+        "year": request.args.get("year", type=int),
+        "agreement": agreement if agreement in AGREEMENT_CHOICES else None,
     }
 
+
+@bp.route("/assignments")
+@login_required
+def assignment_list():
+    """Keyset-paginated, filterable list of the user's assignments (all for admins)."""
+    filters = _assignment_filters()
+    items, next_cursor = list_assignments(
+        current_user,
+        cursor=request.args.get("after"),
+        limit=request.args.get("limit", 50, type=int),
+        **filters,
+    )
+    # Query arguments for the "next page" link, without the old cursor
+    args = {k: v for k, v in request.args.items() if k != "after"}
     return render_template(
-        "analysis.html",
-        llm_chart_data=json.dumps(llm_chart_data),
-        verificator_chart_data=json.dumps(verificator_chart_data),
+        "assignments.html",
+        items=items,
+        next_cursor=next_cursor,
+        args=args,
+        is_first_page=not request.args.get("after"),
+    )
+
+
+@bp.route("/api/assignments")
+@login_required
+def assignment_list_api():
+    """JSON variant of the assignment list; pass next_cursor back as ?after=."""
+    items, next_cursor = list_assignments(
+        current_user,
+        cursor=request.args.get("after"),
+        limit=request.args.get("limit", 50, type=int),
+        **_assignment_filters(),
+    )
+    return jsonify(items=items, next_cursor=next_cursor)
+
+
+@bp.route("/search")
+@login_required
+def search():
+    """Ranked full-text search; verificators only see their own assignments."""
+    query = request.args.get("q", "").strip()
+    page = max(request.args.get("page", 1, type=int), 1)
+    articles, has_next = [], False
+    index_ready = search_index_exists()
+    if query and index_ready:
+        articles, has_next = search_articles(query, current_user, page=page)
+    return render_template(
+        "search.html",
+        query=query,
+        page=page,
+        articles=articles,
+        has_next=has_next,
+        index_ready=index_ready,
+    )
+
+
+@bp.route("/metrics", methods=["GET", "POST"])
+@login_required
+def metrics():
+    """Per-endpoint request timings and slow statements; only when INSTRUMENTATION is on."""
+    if current_user.role != "admin":
+        abort(403)
+    request_metrics = current_app.extensions.get("request_metrics")
+    if request_metrics is None:
+        abort(404)
+    if request.method == "POST":
+        request_metrics.reset()
+        return redirect(url_for("main.metrics"))
+    endpoints, slow_queries = request_metrics.snapshot()
+    return render_template(
+        "metrics.html",
+        endpoints=endpoints,
+        slow_queries=slow_queries,
+        started_at=request_metrics.started_at,
+        slow_query_ms=request_metrics.slow_query_ms,
     )
 
 
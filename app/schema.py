@@ -0,0 +1,59 @@
+from sqlalchemy import inspect, text
+from app import db
+
+
+def ensure_columns():
+    """
+    Adds columns declared on the models that are missing from existing tables.
+    NOT NULL columns can only be added when they declare a server_default.
+    db.create_all() never alters a table that already exists.
+    Returns the "table.column" names that were added.
+    """
+    inspector = inspect(db.engine)
+    preparer = db.engine.dialect.identifier_preparer
+    added = []
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                default = column.server_default
+                if not column.nullable and default is None:
+                    raise RuntimeError(
+                        f"Cannot add NOT NULL column {table.name}.{column.name} in place."
+                    )
+                ddl = (
+                    f"ALTER TABLE {preparer.format_table(table)} "
+                    f"ADD COLUMN {preparer.format_column(column)} "
+                    f"{column.type.compile(dialect=db.engine.dialect)}"
+                )
+                if default is not None:
+                    arg = default.arg
+                    ddl += f" DEFAULT {arg if isinstance(arg, str) else arg.text}"
+                if not column.nullable:
+                    ddl += " NOT NULL"
+                connection.execute(text(ddl))
+                added.append(f"{table.name}.{column.name}")
+    return added
+
+
+def ensure_indexes():
+    """
+    Creates indexes declared on the models that are missing from an existing database.
+    db.create_all() only creates indexes together with new tables.
+    Returns the names of the indexes that were created.
+    """
+    inspector = inspect(db.engine)
+    created = []
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            if index.name not in existing:
+                index.create(bind=db.engine)
+                created.append(index.name)
+    return created
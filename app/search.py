@@ -0,0 +1,130 @@
+import re
+from sqlalchemy import column, func, table, text
+from app import db
+from app.models import Article, LLMResult, VerificationAssignment
+
+# FTS5 virtual table over article text and LLM justifications. Articles and
+# justifications are separate rows keyed by article_id, so a justification can
+# be indexed as soon as its result is ingested without rewriting the article row.
+SEARCH_TABLE = "article_search"
+article_search = table(
+    SEARCH_TABLE,
+    column("article_id"),
+    column("title"),
+    column("abstract"),
+    column("justification"),
+    column("rank"),
+)
+
+_TOKEN_PATTERN = re.compile(r"\w+\*?", re.UNICODE)
+
+
+def search_index_exists():
+    """True if the FTS5 table exists; it is only created on SQLite databases."""
+    if db.engine.dialect.name != "sqlite":
+        return False
+    return (
+        db.session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": SEARCH_TABLE},
+        ).first()
+        is not None
+    )
+
+
+def create_search_index():
+    """Creates the FTS5 table on SQLite. Returns False for other databases."""
+    if db.engine.dialect.name != "sqlite":
+        return False
+    db.session.execute(
+        text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+            "title, abstract, justification, article_id UNINDEXED, "
+            "tokenize = 'porter unicode61')"
+        )
+    )
+    db.session.commit()
+    return True
+
+
+def index_articles(condition):
+    """Adds the articles matching condition to the search index, in the caller's transaction."""
+    db.session.execute(
+        article_search.insert().from_select(
+            ["article_id", "title", "abstract"],
+            db.select(Article.id, Article.title, Article.abstract).where(condition),
+        )
+    )
+
+
+def index_justifications(condition):
+    """Adds the justifications of the LLM results matching condition to the search index."""
+    db.session.execute(
+        article_search.insert().from_select(
+            ["article_id", "justification"],
+            db.select(LLMResult.article_id, LLMResult.justification).where(
+                condition, LLMResult.justification.is_not(None)
+            ),
+        )
+    )
+
+
+def rebuild_search_index():
+    """Repopulates the whole index from the article and llm_result tables."""
+    db.session.execute(article_search.delete())
+    index_articles(db.true())
+    index_justifications(db.true())
+    db.session.execute(
+        text(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')")
+    )
+    db.session.commit()
+
+
+def to_match_query(query):
+    """
+    Turns free text into a safe FTS5 query: every word is quoted and all must match.
+    A trailing * keeps prefix matching, e.g. "screen*".
+    """
+    terms = []
+    for token in _TOKEN_PATTERN.findall(query or ""):
+        word = token.rstrip("*")
+        terms.append(f'"{word}"*' if token.endswith("*") else f'"{word}"')
+    return " ".join(terms)
+
+
+def search_articles(query, user=None, page=1, per_page=20):
+    """
+    Ranks articles by their best BM25 match across title, abstract and justifications.
+    Verificators only see their own assignments. Returns (articles, has_next).
+    """
+    match = to_match_query(query)
+    if not match:
+        return [], False
+
+    best_rank = func.min(article_search.c.rank).label("best_rank")
+    ranked = (
+        db.select(article_search.c.article_id, best_rank)
+        .where(text(f"{SEARCH_TABLE} MATCH :match").bindparams(match=match))
+        .group_by(article_search.c.article_id)
+        .order_by(best_rank)
+        .limit(per_page + 1)
+        .offset((page - 1) * per_page)
+    )
+    if user is not None and user.role != "admin":
+        ranked = ranked.where(
+            article_search.c.article_id.in_(
+                db.select(VerificationAssignment.article_id).where(
+                    VerificationAssignment.user_id == user.id
+                )
+            )
+        )
+
+    article_ids = list(db.session.scalars(ranked))
+    has_next = len(article_ids) > per_page
+    article_ids = article_ids[:per_page]
+
+    articles = {
+        article.id: article
+        for article in Article.query.filter(Article.id.in_(article_ids))
+    }
+    return [articles[i] for i in article_ids if i in articles], has_next
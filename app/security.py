@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class PasswordHasher:
+    """
+    Hashes and checks passwords with the configured werkzeug method on a small,
+    bounded thread pool. hashlib releases the GIL while hashing, so a burst of
+    logins occupies at most max_workers cores and leaves the rest free to serve
+    requests from users who are already signed in.
+    """
+
+    def __init__(self, method="scrypt", salt_length=16, max_workers=2):
+        self.method = method
+        self.salt_length = salt_length
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hash"
+        )
+        self._prefix = None
+
+    @property
+    def prefix(self):
+        """The stored "method$" prefix, e.g. "scrypt:32768:8:1", with defaults expanded."""
+        if self._prefix is None:
+            self._prefix = self.hash("").split("$", 1)[0]
+        return self._prefix
+
+    def hash(self, password):
+        return self.executor.submit(
+            generate_password_hash, password, self.method, self.salt_length
+        ).result()
+
+    def check(self, pwhash, password):
+        return self.executor.submit(check_password_hash, pwhash, password).result()
+
+    def needs_rehash(self, pwhash):
+        """True if a stored hash uses a method, cost or salt length other than the configured ones."""
+        method, _, rest = pwhash.partition("$")
+        salt = rest.partition("$")[0]
+        return method != self.prefix or len(salt) != self.salt_length
+
+
+def init_password_hasher(app):
+    app.extensions["password_hasher"] = PasswordHasher(
+        method=app.config.get("PASSWORD_HASH_METHOD", "scrypt"),
+        salt_length=app.config.get("PASSWORD_SALT_LENGTH", 16),
+        max_workers=app.config.get("PASSWORD_HASH_WORKERS", 2),
+    )
+
+
+def get_password_hasher():
+    """The app's hasher, or werkzeug defaults run inline outside an app context."""
+    if has_app_context() and "password_hasher" in current_app.extensions:
+        return current_app.extensions["password_hasher"]
+    return None
+
+
+def hash_password(password):
+    hasher = get_password_hasher()
+    if hasher is None:
+        return generate_password_hash(password)
+    return hasher.hash(password)
+
+
+def verify_password(pwhash, password):
+    hasher = get_password_hasher()
+    if hasher is None:
+        return check_password_hash(pwhash, password)
+    return hasher.check(pwhash, password)
+
+
+def password_needs_rehash(pwhash):
+    hasher = get_password_hasher()
+    return hasher is not None and hasher.needs_rehash(pwhash)
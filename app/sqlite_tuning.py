@@ -0,0 +1,42 @@
+from sqlalchemy import event
+
+# Values PRAGMA queries report back for the symbolic settings in SQLITE_PRAGMAS
+_SYMBOLIC_VALUES = {
+    "synchronous": {"OFF": 0, "NORMAL": 1, "FULL": 2, "EXTRA": 3},
+    "temp_store": {"DEFAULT": 0, "FILE": 1, "MEMORY": 2},
+}
+
+
+def install_sqlite_pragmas(engine, pragmas):
+    """Runs the given PRAGMA statements on every new connection of a SQLite engine."""
+    if not pragmas or engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def read_sqlite_pragmas(engine, names):
+    """Returns the active value of each named PRAGMA on a pooled connection."""
+    with engine.connect() as connection:
+        return {
+            name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+            for name in names
+        }
+
+
+def pragma_mismatches(engine, pragmas):
+    """Returns {name: (expected, active)} for pragmas that did not take effect."""
+    if not pragmas or engine.dialect.name != "sqlite":
+        return {}
+    active = read_sqlite_pragmas(engine, pragmas)
+    mismatches = {}
+    for name, expected in pragmas.items():
+        wanted = _SYMBOLIC_VALUES.get(name, {}).get(str(expected).upper(), expected)
+        if str(active[name]).lower() != str(wanted).lower():
+            mismatches[name] = (expected, active[name])
+    return mismatches
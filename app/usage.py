@@ -0,0 +1,83 @@
+import numpy as np
+from app import db
+from app.models import LLMResult
+
+# num_token_in/out hold token count x price per 1M tokens
+MICRO_DOLLARS = 1_000_000
+
+
+def _percentiles(values, quantiles):
+    """nan-aware percentiles; None when there are no observations."""
+    if not np.any(~np.isnan(values)):
+        return [None] * len(quantiles)
+    return [float(v) for v in np.nanpercentile(values, quantiles)]
+
+
+def compute_usage_stats():
+    """
+    Per-model cost, latency and throughput statistics from one narrow extract of
+    the llm_result table, grouped and summarized with NumPy.
+    """
+    rows = db.session.execute(
+        db.select(
+            LLMResult.llm_model_name,
+            LLMResult.duration,
+            LLMResult.num_token_in,
+            LLMResult.num_token_out,
+            LLMResult.tokens_out,
+        ).order_by(LLMResult.llm_model_name)
+    ).all()
+    if not rows:
+        return []
+
+    models, duration, cost_in, cost_out, tokens_out = zip(*rows)
+    models = np.asarray(models, dtype=object)
+    duration = np.asarray(duration, dtype=float)  # None becomes nan
+    cost = (
+        np.nan_to_num(np.asarray(cost_in, dtype=float))
+        + np.nan_to_num(np.asarray(cost_out, dtype=float))
+    ) / MICRO_DOLLARS
+    tokens_out = np.asarray(tokens_out, dtype=float)
+
+    # Rows are sorted by model, so each model is one contiguous slice
+    names, starts = np.unique(models, return_index=True)
+    bounds = list(starts) + [models.size]
+
+    stats = []
+    for name, start, end in zip(names, bounds[:-1], bounds[1:]):
+        model_cost = cost[start:end]
+        model_duration = duration[start:end]
+        model_tokens = tokens_out[start:end]
+
+        timed = ~np.isnan(model_duration) & (model_duration > 0)
+        counted = timed & ~np.isnan(model_tokens)
+        total_time = float(model_duration[timed].sum())
+
+        cost_p50, cost_p95 = _percentiles(model_cost, [50, 95])
+        latency_p50, latency_p95, latency_p99 = _percentiles(
+            model_duration, [50, 95, 99]
+        )
+        stats.append(
+            {
+                "model": name,
+                "results": int(end - start),
+                "total_cost": float(model_cost.sum()),
+                "mean_cost": float(model_cost.mean()),
+                "cost_p50": cost_p50,
+                "cost_p95": cost_p95,
+                "latency_mean": (
+                    float(model_duration[timed].mean()) if timed.any() else None
+                ),
+                "latency_p50": latency_p50,
+                "latency_p95": latency_p95,
+                "latency_p99": latency_p99,
+                "total_time": total_time,
+                # Output tokens per second of generation time, over rows with token counts
+                "tokens_per_second": (
+                    float(model_tokens[counted].sum() / model_duration[counted].sum())
+                    if counted.any()
+                    else None
+                ),
+            }
+        )
+    return stats
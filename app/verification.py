@@ -0,0 +1,84 @@
+from sqlalchemy import case
+from app import db
+from app.analysis import AGREEMENT_STATS, VERIFICATOR_CHART, invalidate_analysis
+from app.models import VerificationAssignment
+from app.progress import record_reviews
+
+# Keeps the CASE expression and IN list well inside SQLite's bound-parameter limit
+MAX_BATCH_SIZE = 1000
+
+
+def first_unreviewed_article_id(user_id):
+    """The lowest article ID the user still has to review, or None."""
+    return db.session.scalar(
+        db.select(VerificationAssignment.article_id)
+        .where(
+            VerificationAssignment.user_id == user_id,
+            VerificationAssignment.is_reviewed.is_(False),
+        )
+        .order_by(VerificationAssignment.article_id)
+        .limit(1)
+    )
+
+
+def apply_decisions(user_id, decisions):
+    """
+    Applies {article_id: is_relevant} decisions for one verificator in a single
+    transaction. A guarded UPDATE first marks the still-unreviewed rows reviewed;
+    only the rows it actually flipped are counted, so concurrent posts of the same
+    decisions cannot inflate the progress counters. A second bulk UPDATE then picks
+    each new value from a CASE on article_id, touching only rows whose decision
+    changes. Both bump the row version. Analysis snapshots are invalidated too.
+    Returns a dict with the updated, newly reviewed and unknown article IDs.
+    """
+    if len(decisions) > MAX_BATCH_SIZE:
+        raise ValueError(f"At most {MAX_BATCH_SIZE} decisions per batch.")
+
+    known = set(
+        db.session.scalars(
+            db.select(VerificationAssignment.article_id).where(
+                VerificationAssignment.user_id == user_id,
+                VerificationAssignment.article_id.in_(list(decisions)),
+            )
+        )
+    )
+    unknown = sorted(set(decisions) - known)
+    decisions = {a: d for a, d in decisions.items() if a in known}
+    if not decisions:
+        db.session.commit()
+        return {"updated": [], "newly_reviewed": [], "unknown": unknown}
+
+    assigned = (
+        VerificationAssignment.user_id == user_id,
+        VerificationAssignment.article_id.in_(list(decisions)),
+    )
+    newly_reviewed = db.session.scalars(
+        db.update(VerificationAssignment)
+        .where(*assigned, VerificationAssignment.is_reviewed.is_(False))
+        .values(is_reviewed=True, version=VerificationAssignment.version + 1)
+        .returning(VerificationAssignment.article_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    record_reviews(user_id, len(newly_reviewed))
+
+    new_value = case(decisions, value=VerificationAssignment.article_id)
+    changed = db.session.scalars(
+        db.update(VerificationAssignment)
+        .where(
+            *assigned, VerificationAssignment.is_relevant.is_distinct_from(new_value)
+        )
+        .values(is_relevant=new_value, version=VerificationAssignment.version + 1)
+        .returning(VerificationAssignment.article_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    updated = sorted(set(newly_reviewed) | set(changed))
+    if updated:
+        invalidate_analysis(VERIFICATOR_CHART, AGREEMENT_STATS)
+    db.session.commit()
+
+    return {
+        "updated": updated,
+        "newly_reviewed": sorted(newly_reviewed),
+        "unknown": unknown,
+    }
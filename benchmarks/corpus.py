@@ -0,0 +1,145 @@
+import os
+import random
+from itertools import islice
+import tempfile
+from werkzeug.security import generate_password_hash
+from config import Config
+from app import create_app, db
+from app.compression import compress_text
+from app.models import User, Article, LLMResult, VerificationAssignment
+from app.progress import rebuild_progress
+
+DEFAULT_MODELS = ["Llama-4-Maverick", "Kimi-K2-Instruct", "Gemma-2-Instruct"]
+SOURCES = ["Scopus", "WoS", "IEEE", "ACM", None]
+
+
+def make_benchmark_app(db_path=None, config_class=Config):
+    """Creates an app bound to a throwaway SQLite file. Returns (app, db_path)."""
+    if db_path is None:
+        fd, db_path = tempfile.mkstemp(prefix="slr-bench-", suffix=".db")
+        os.close(fd)
+
+    class BenchmarkConfig(config_class):
+        SQLALCHEMY_DATABASE_URI = "sqlite:///" + db_path
+        TESTING = True
+
+    return create_app(BenchmarkConfig), db_path
+
+
+def _insert_batches(model, rows, batch_size):
+    """Inserts rows from any iterable, batch_size at a time, so generators stay lazy."""
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        db.session.execute(db.insert(model), batch)
+    db.session.commit()
+
+
+def _llm_result_row(rnd, model_name, article_id):
+    tokens_in = rnd.randint(500, 3000)
+    tokens_out = rnd.randint(50, 800)
+    return {
+        "success": True,
+        "_raw_compressed": compress_text(
+            f"Synthetic response for article {article_id}. " * 40
+        ),
+        "is_relevant": rnd.random() < 0.4,
+        "_addressed_areas": '["screening", "automation"]',
+        "justification": f"Synthetic justification for {article_id}.",
+        "duration": rnd.uniform(0.5, 20),
+        "tokens_in": tokens_in,
+        "tokens_out": tokens_out,
+        # Stored like seed-llm does: tokens x price per 1M tokens
+        "num_token_in": tokens_in * 0.5,
+        "num_token_out": tokens_out * 1.5,
+        "llm_model_name": model_name,
+        "article_id": article_id,
+    }
+
+
+def generate_corpus(
+    num_articles,
+    num_verificators=7,
+    models=DEFAULT_MODELS,
+    reviewers_per_article=2,
+    reviewed_ratio=0.5,
+    seed=0,
+    batch_size=5000,
+):
+    """
+    Fills the bound database with a synthetic corpus: articles, one LLMResult per
+    model and article, and round-robin assignments across the verificators.
+    Rows are generated lazily and inserted batch_size at a time, so memory does
+    not grow with the corpus. Every user's password equals their username. Must run inside an app context.
+    """
+    rnd = random.Random(seed)
+    db.create_all()
+
+    users = [
+        {
+            "username": f"verificator{i}",
+            "password_hash": generate_password_hash(f"verificator{i}"),
+            "role": "verificator",
+        }
+        for i in range(1, num_verificators + 1)
+    ]
+    users.append(
+        {
+            "username": "admin",
+            "password_hash": generate_password_hash("admin"),
+            "role": "admin",
+        }
+    )
+    _insert_batches(User, users, batch_size)
+    verificator_ids = list(
+        db.session.scalars(
+            db.select(User.id).filter_by(role="verificator").order_by(User.id)
+        )
+    )
+
+    _insert_batches(
+        Article,
+        (
+            {
+                "id": article_id,
+                "doi": f"10.0000/bench.{article_id}",
+                "title": f"Synthetic article {article_id} on systematic reviews",
+                "abstract": " ".join(
+                    rnd.choice(["model", "review", "screening", "llm", "study"])
+                    for _ in range(120)
+                ),
+                "year": rnd.randint(2000, 2025),
+                "source": rnd.choice(SOURCES),
+            }
+            for article_id in range(1, num_articles + 1)
+        ),
+        batch_size,
+    )
+
+    for model_name in models:
+        _insert_batches(
+            LLMResult,
+            (
+                _llm_result_row(rnd, model_name, article_id)
+                for article_id in range(1, num_articles + 1)
+            ),
+            batch_size,
+        )
+
+    reviewers = min(reviewers_per_article, len(verificator_ids))
+
+    def assignments():
+        for article_id in range(1, num_articles + 1):
+            for slot in range(reviewers):
+                user_id = verificator_ids[
+                    (article_id * reviewers + slot) % len(verificator_ids)
+                ]
+                reviewed = rnd.random() < reviewed_ratio
+                yield {
+                    "user_id": user_id,
+                    "article_id": article_id,
+                    "is_reviewed": reviewed,
+                    "is_relevant": (rnd.random() < 0.4) if reviewed else None,
+                }
+
+    _insert_batches(VerificationAssignment, assignments(), batch_size)
+    rebuild_progress()
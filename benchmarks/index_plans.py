@@ -0,0 +1,101 @@
+"""
+Shows SQLite query plans and timings for the hot access paths, before and after
+the model indexes are created.
+
+    python -m benchmarks.index_plans --articles 50000
+"""
+
+import argparse
+import os
+import random
+import time
+from sqlalchemy import text
+from app import db
+from app.schema import ensure_indexes
+from benchmarks.corpus import generate_corpus, make_benchmark_app
+
+QUERIES = {
+    "dashboard: assignment check": (
+        "SELECT id FROM verification_assignment "
+        "WHERE user_id = :user_id AND article_id = :article_id"
+    ),
+    "dashboard: previous article": (
+        "SELECT article_id FROM verification_assignment "
+        "WHERE user_id = :user_id AND article_id < :article_id "
+        "ORDER BY article_id DESC LIMIT 1"
+    ),
+    "dashboard_redirect: first unreviewed": (
+        "SELECT article_id FROM verification_assignment "
+        "WHERE user_id = :user_id AND is_reviewed = 0 "
+        "ORDER BY article_id LIMIT 1"
+    ),
+    "progress: reviewed per user": (
+        "SELECT count(*) FROM verification_assignment "
+        "WHERE user_id = :user_id AND is_reviewed = 1"
+    ),
+    "dashboard: llm results": (
+        "SELECT id, llm_model_name FROM llm_result WHERE article_id = :article_id"
+    ),
+    "analysis: assignments per article": (
+        "SELECT count(*) FROM verification_assignment WHERE article_id = :article_id"
+    ),
+    "seed-llm: existing results": (
+        "SELECT article_id FROM llm_result WHERE llm_model_name = :model_name"
+    ),
+}
+
+
+def drop_model_indexes():
+    """Drops the non-unique indexes declared on the models to simulate an old database."""
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            db.session.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+    db.session.commit()
+
+
+def report(label, num_articles, repeats):
+    print(f"\n=== {label} ===")
+    rnd = random.Random(1)
+    for name, sql in QUERIES.items():
+        params = {
+            "user_id": 1,
+            "article_id": rnd.randint(1, num_articles),
+            "model_name": "Kimi-K2-Instruct",
+        }
+        plan = db.session.execute(text("EXPLAIN QUERY PLAN " + sql), params).all()
+        started = time.perf_counter()
+        for _ in range(repeats):
+            params["article_id"] = rnd.randint(1, num_articles)
+            db.session.execute(text(sql), params).all()
+        elapsed_ms = (time.perf_counter() - started) * 1000 / repeats
+        print(f"{name:<40} {elapsed_ms:8.3f} ms/query")
+        for row in plan:
+            print(f"    {row[-1]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--verificators", type=int, default=7)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    app, db_path = make_benchmark_app()
+    try:
+        with app.app_context():
+            generate_corpus(args.articles, num_verificators=args.verificators)
+            drop_model_indexes()
+            db.session.execute(text("ANALYZE"))
+            report("Before: unique constraints only", args.articles, args.repeats)
+
+            created = ensure_indexes()
+            db.session.execute(text("ANALYZE"))
+            db.session.commit()
+            print(f"\nCreated indexes: {', '.join(created)}")
+            report("After: model indexes", args.articles, args.repeats)
+    finally:
+        os.remove(db_path)
+
+
+if __name__ == "__main__":
+    main()
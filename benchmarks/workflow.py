@@ -0,0 +1,176 @@
+"""
+Load-tests the review workflow on a synthetic corpus: dashboard views, verification
+submits and the analysis page, driven concurrently through the Flask test client.
+Reports latency percentiles and queries per request for each path.
+
+    python -m benchmarks.workflow --articles 10000 --threads 8 --requests 500
+"""
+
+import argparse
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from app import db
+from app.models import User, VerificationAssignment
+from benchmarks.corpus import DEFAULT_MODELS, generate_corpus, make_benchmark_app
+from config import config_by_name
+
+_SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+def _login(client, user_id):
+    with client.session_transaction() as session:
+        session["_user_id"] = str(user_id)
+        session["_fresh"] = True
+
+
+def _plan(scenario, count, queues, admin_id, rnd):
+    """Builds (user_id, method, path, data, expected_status) tuples for one scenario."""
+    users = list(queues)
+    work = []
+    for _ in range(count):
+        if scenario == "analysis":
+            work.append((admin_id, "GET", "/analysis", None, 200))
+            continue
+        user_id = rnd.choice(users)
+        article_id = rnd.choice(queues[user_id])
+        if scenario == "dashboard":
+            work.append((user_id, "GET", f"/dashboard/{article_id}", None, 200))
+        else:
+            decision = rnd.choice(["true", "false"])
+            work.append(
+                (
+                    user_id,
+                    "POST",
+                    f"/verify/{article_id}",
+                    {"is_relevant": decision},
+                    302,
+                )
+            )
+    return work
+
+
+def run_scenario(app, work, threads):
+    """
+    Replays the work list on a thread pool, one logged-in test client per
+    (thread, user). Returns (latencies in ms, queries per request, errors, wall seconds).
+    """
+    local = threading.local()
+
+    def request(item):
+        user_id, method, path, data, expected = item
+        clients = getattr(local, "clients", None)
+        if clients is None:
+            clients = local.clients = {}
+        client = clients.get(user_id)
+        if client is None:
+            client = clients[user_id] = app.test_client()
+            _login(client, user_id)
+        started = time.perf_counter()
+        response = client.open(path, method=method, data=data)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        match = _SERVER_TIMING_DB.search(response.headers.get("Server-Timing", ""))
+        queries = int(match.group(2)) if match else None
+        return elapsed_ms, queries, response.status_code == expected
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(request, work))
+    wall = time.perf_counter() - started
+
+    latencies = np.array([r[0] for r in results])
+    queries = np.array([r[1] for r in results if r[1] is not None])
+    errors = sum(1 for r in results if not r[2])
+    return latencies, queries, errors, wall
+
+
+def report(name, latencies, queries, errors, wall):
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(
+        f"{name:<22} {latencies.size:>8} {latencies.size / wall:>8.1f} "
+        f"{p50:>9.2f} {p95:>9.2f} {p99:>9.2f} "
+        f"{queries.mean() if queries.size else float('nan'):>8.1f} {errors:>7}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=1000)
+    parser.add_argument("--verificators", type=int, default=7)
+    parser.add_argument(
+        "--models",
+        type=int,
+        default=len(DEFAULT_MODELS),
+        help="Number of LLM models with a result per article.",
+    )
+    parser.add_argument(
+        "--requests", type=int, default=300, help="Requests per scenario."
+    )
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument(
+        "--config",
+        choices=list(config_by_name),
+        default="production",
+        help="Config profile the app runs with (production enables WAL).",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--keep-db", action="store_true", help="Keep the generated database file."
+    )
+    args = parser.parse_args()
+
+    class WorkflowConfig(config_by_name[args.config]):
+        # Server-Timing headers report the query count of every request
+        INSTRUMENTATION = True
+
+    models = DEFAULT_MODELS + [
+        f"Model-{i}" for i in range(len(DEFAULT_MODELS), args.models)
+    ]
+    app, db_path = make_benchmark_app(config_class=WorkflowConfig)
+    try:
+        with app.app_context():
+            started = time.perf_counter()
+            generate_corpus(
+                args.articles,
+                num_verificators=args.verificators,
+                models=models[: args.models],
+                seed=args.seed,
+            )
+            print(
+                f"Generated {args.articles} articles x {args.models} models, "
+                f"{args.verificators} verificators in {time.perf_counter() - started:.1f}s "
+                f"({db_path})"
+            )
+            queues = {}
+            for user_id, article_id in db.session.execute(
+                db.select(
+                    VerificationAssignment.user_id, VerificationAssignment.article_id
+                )
+            ):
+                queues.setdefault(user_id, []).append(article_id)
+            admin_id = db.session.scalar(db.select(User.id).filter_by(role="admin"))
+            db.session.remove()
+
+        rnd = random.Random(args.seed)
+        print(
+            f"\n{'Scenario':<22} {'Requests':>8} {'Req/s':>8} "
+            f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'Queries':>8} {'Errors':>7}"
+        )
+        # Submits invalidate the analysis snapshots, so the first analysis request
+        # after them pays for a rebuild; the rest are served from the snapshot.
+        for scenario in ("dashboard", "submit_verification", "analysis"):
+            work = _plan(scenario, args.requests, queues, admin_id, rnd)
+            report(scenario, *run_scenario(app, work, args.threads))
+    finally:
+        if not args.keep_db:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,3 +19,60 @@ class Config:
         "DATABASE_URL"
     ) or "sqlite:///" + os.path.join(basedir, "instance", "app.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # PRAGMA statements run on every new SQLite connection (ignored for other databases)
+    SQLITE_PRAGMAS = {}
+
+    # In-process cache for the Flask-Login user loader. The TTL is its only
+    # invalidation for changes made by another process: a role change from
+    # "flask seed-users" reaches running web workers after up to USER_CACHE_TTL
+    # seconds. Set either value to 0 to disable the cache.
+    USER_CACHE_SIZE = 256
+    USER_CACHE_TTL = 60
+
+    # Opt-in per-request SQL and render timing: adds a Server-Timing header to
+    # every response and an admin /metrics page. Statements slower than
+    # SLOW_QUERY_MS are logged there; METRICS_WINDOW recent requests per
+    # endpoint feed the latency percentiles.
+    INSTRUMENTATION = os.environ.get("INSTRUMENTATION", "").lower() in ("1", "true")
+    SLOW_QUERY_MS = 100
+    METRICS_WINDOW = 500
+
+    # werkzeug generate_password_hash parameters, e.g. "scrypt:16384:8:1" or
+    # "pbkdf2:sha256:600000". Stored hashes that use other parameters are
+    # upgraded the next time their user logs in. Hashing runs on a pool of
+    # PASSWORD_HASH_WORKERS threads so login bursts cannot take every core.
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt")
+    PASSWORD_SALT_LENGTH = 16
+    PASSWORD_HASH_WORKERS = 2
+
+
+class ProductionConfig(Config):
+    """Configuration for several concurrent verificators on a single SQLite file."""
+
+    # WAL lets readers proceed while a verification is being committed, and
+    # busy_timeout makes writers wait for the lock instead of failing with
+    # "database is locked". synchronous=NORMAL is durable in WAL mode except
+    # for the last transactions on power loss.
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,  # milliseconds
+        "cache_size": -64000,  # negative means KiB, so 64 MB per connection
+        "mmap_size": 268435456,  # 256 MB
+        "temp_store": "MEMORY",
+    }
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": 10,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_pre_ping": True,
+        # sqlite3's own lock wait in seconds, matching busy_timeout
+        "connect_args": {"timeout": 5},
+    }
+
+
+config_by_name = {
+    "development": Config,
+    "production": ProductionConfig,
+}